@@ -0,0 +1,89 @@
+"""
+FantasyPros projection parsing: pd.read_html(flavor="html5lib") + MultiIndex
+flattening + split_player_team (old path) vs fp_parser.parse_projections_table.
+
+    python benchmarks/bench_fp_parser.py            # saved pages in fixtures/fantasypros, else synthetic
+    python benchmarks/bench_fp_parser.py --save     # fetch live pages into fixtures/fantasypros first
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+from fp_parser import parse_projections_table
+from benchmarks.synthetic import FP_COLUMNS, fantasypros_page
+from utils import split_player_team
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "fantasypros")
+
+
+def old_path(html: str) -> pd.DataFrame:
+    df = pd.read_html(io.StringIO(html), flavor="html5lib")[0]
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = ['_'.join(filter(None, col)).strip() for col in df.columns.values]
+    df = df.rename(columns={'MISC_FPTS': 'FPTS', df.columns[0]: 'Player'})
+    df = split_player_team(df)
+    df['FPTS'] = pd.to_numeric(df['FPTS'], errors='coerce')
+    return df
+
+
+def new_path(html: str) -> pd.DataFrame:
+    return split_player_team(parse_projections_table(html))
+
+
+def load_pages(save: bool) -> dict:
+    if save:
+        from sleeper_client import http_get
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        for pos in FP_COLUMNS:
+            r = http_get(f"https://www.fantasypros.com/nfl/projections/{pos}.php?week=draft")
+            r.raise_for_status()
+            with open(os.path.join(FIXTURE_DIR, f"{pos}_draft.html"), "w", encoding="utf-8") as f:
+                f.write(r.text)
+
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        print(f"No saved pages in {FIXTURE_DIR}; using synthetic pages.")
+        pages = {f"synthetic_{pos}": fantasypros_page(pos) for pos in FP_COLUMNS}
+    return pages
+
+
+def timed(fn, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--save", action="store_true", help="fetch live FantasyPros pages into the fixture dir first")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    rows = []
+    for name, html in load_pages(args.save).items():
+        old_s, old_df = timed(old_path, html, args.repeat)
+        new_s, new_df = timed(new_path, html, args.repeat)
+        cols = ["Player", "Team", "FPTS"]
+        same = old_df[cols].reset_index(drop=True).equals(new_df[cols].reset_index(drop=True))
+        rows.append({"page": name, "KB": len(html) // 1024, "rows": len(new_df),
+                     "read_html ms": round(old_s * 1000, 1), "parser ms": round(new_s * 1000, 1),
+                     "speedup": round(old_s / new_s, 1), "same output": same})
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
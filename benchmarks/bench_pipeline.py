@@ -0,0 +1,272 @@
+"""
+The compute pipeline at league scale (10 / 100 / 1000 teams in one
+league) and multi-league scale (1 / 10 / 100 leagues of 12 teams):
+
+    split_player_team, calculate_dynamic_vorp, assign_grades,
+    get_draft_grades, calculate_power_scores, get_matchups_with_owners,
+    get_playoff_odds, get_win_probabilities, build_recap, evaluate_trades
+
+plus load_snapshots (LeagueSnapshot.load_many, i.e. the Sleeper fetches).
+
+Every scenario runs in a fresh subprocess with its own cache directory and all
+HTTP replayed (SWISH_HTTP_MODE=replay) from a fixture store of synthetic
+Sleeper / FantasyPros responses, so runs are offline and repeatable.
+
+Per function it records the best wall time over --repeat runs (after one warm-up
+call) and the tracemalloc peak of one extra run; per scenario the process's
+peak RSS. Results are written as JSON. With --baseline, any time or peak memory
+more than --threshold above the baseline is reported and the exit status is 1.
+
+    python benchmarks/bench_pipeline.py [--output results.json] [--baseline old.json] [--threshold 0.25]
+    python benchmarks/bench_pipeline.py --teams 10 100 --leagues 1 10 --repeat 5
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "pipeline.json")
+LEAGUE_SIZE = 12  # teams per league in the multi-league scenarios
+WEEK = 6
+TRADE_ROUNDS = 17  # a full season of transaction rounds for evaluate_trades
+
+# Differences below these floors are noise, whatever the ratio
+TIME_FLOOR = 0.002  # seconds
+MEMORY_FLOOR = 256 * 1024  # bytes
+
+
+# -------------------------
+# Fixtures
+# -------------------------
+
+def write_fixtures(directory: str, n_teams: int, n_leagues: int) -> list:
+    """Fill a replay store with one scenario's HTTP responses; returns the league ids."""
+    from benchmarks.synthetic import POSITIONS, fantasypros_page, sleeper_league, sleeper_players
+    from http_replay import ReplayStore
+    from sleeper_client import FANTASYPROS_BASE_URL, SLEEPER_BASE_URL
+
+    store = ReplayStore(directory)
+    # Enough players to deal every roster without repeats, as FantasyPros-sized pages
+    n_per_position = max(150, math.ceil(n_teams * 16 / len(POSITIONS)))
+    players = sleeper_players(n_per_position)
+    store.put(f"{SLEEPER_BASE_URL}/players/nfl", json.dumps(players).encode())
+
+    for position in POSITIONS:
+        page = fantasypros_page(position, n_players=n_per_position, seed=POSITIONS.index(position)).encode()
+        for week in ("draft", WEEK):
+            store.put(f"{FANTASYPROS_BASE_URL}/nfl/projections/{position}.php?week={week}", page,
+                      content_type="text/html; charset=utf-8")
+
+    league_ids = [str(1_000_000_000 + i) for i in range(n_leagues)]
+    for i, league_id in enumerate(league_ids):
+        for path, payload in sleeper_league(league_id, n_teams, players, week=WEEK, seed=i).items():
+            store.put(f"{SLEEPER_BASE_URL}/{path}", json.dumps(payload).encode())
+    return league_ids
+
+
+# -------------------------
+# Worker (one scenario, one process)
+# -------------------------
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # warm-up: disk caches, identity index, player store
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run_scenario(n_teams: int, n_leagues: int, repeat: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="swish-bench-")
+    # Must be set before any repo module reads them at import time
+    os.environ.update({
+        "SWISH_CACHE_DIR": os.path.join(workdir, "cache"),
+        "SWISH_HTTP_MODE": "replay",
+        "SWISH_REPLAY_DIR": os.path.join(workdir, "replay"),
+        "SWISH_REPLAY_LATENCY": "0",
+        "SWISH_REFRESHER": "external",
+    })
+    league_ids = write_fixtures(os.environ["SWISH_REPLAY_DIR"], n_teams, n_leagues)
+
+    import pandas as pd
+    from fp_parser import parse_projections_table
+    from matchup_history import sync_history
+    from matchup_odds import get_win_probabilities
+    from matchup_recap import build_recap
+    from benchmarks.synthetic import fantasycalc_values, sleeper_players, sleeper_transactions
+    from trade_engine import evaluate_trades, positional_need
+    from trade_values import parse_values
+    from transaction_history import get_transactions, write_round
+    from playoff_odds import get_playoff_odds
+    from scoring_engine import league_points
+    from sleeper_client import FANTASYPROS_BASE_URL, http_get
+    from utils import (
+        LeagueSnapshot, assign_grades, calculate_dynamic_vorp, calculate_power_scores,
+        fetch_weekly_projections, get_all_projections, get_draft_grades, get_matchups_with_owners,
+        add_vorp_column, get_player_info, get_player_map, get_standings, get_starters_df, split_player_team
+    )
+
+    raw_proj = pd.concat([
+        parse_projections_table(http_get(f"{FANTASYPROS_BASE_URL}/nfl/projections/{pos}.php?week=draft").text)
+        for pos in ("qb", "rb", "wr", "te")
+    ], ignore_index=True)
+
+    snapshots = list(LeagueSnapshot.load_many(league_ids, with_matchups=True).values())
+    for s in snapshots:  # played weeks for the playoff odds, as the refresher stores them
+        sync_history(s.league_id, s.current_week)
+    proj_df = get_all_projections()
+    standings = [get_standings(s) for s in snapshots]
+    grades = [get_draft_grades(s) for s in snapshots]
+    team_scores = [dict(zip(g["Owner"], g["Draft Score"])) for g in grades]
+    power = [calculate_power_scores(st, g, s) for st, g, s in zip(standings, grades, snapshots)]
+    weekly_proj, player_map = fetch_weekly_projections(WEEK), get_player_map()
+    starters = pd.concat([get_starters_df(s.matchups(), None, s.roster_to_owner, weekly_proj, player_map)
+                          .assign(**{"League ID": s.league_id}) for s in snapshots], ignore_index=True)
+    player_info = get_player_info()
+
+    # A season of trades per league, written straight to the transaction store
+    players = sleeper_players(max(150, math.ceil(n_teams * 16 / 6)))
+    for s in snapshots:
+        for rnd in range(1, TRADE_ROUNDS + 1):
+            write_round(s.league_id, rnd, sleeper_transactions(s.league_id, n_teams, players, rnd))
+    trade_moves = pd.concat([get_transactions(s.league_id).moves.assign(**{"League ID": s.league_id})
+                             for s in snapshots], ignore_index=True)
+    trade_moves = trade_moves[trade_moves["type"] == "trade"]
+    values = parse_values(fantasycalc_values(players)).reset_index()
+    trade_values = pd.concat([values.assign(**{"League ID": s.league_id}) for s in snapshots], ignore_index=True)
+    need = pd.concat([positional_need(s.rosters, s.league.get("roster_positions"), player_info["position"])
+                      .assign(**{"League ID": s.league_id}) for s in snapshots], ignore_index=True)
+    vorp_dfs = [add_vorp_column(proj_df, s.league) for s in snapshots]
+
+    def load_snapshots():
+        for s in LeagueSnapshot.load_many(league_ids, with_matchups=True).values():
+            s.matchups()
+
+    cases = {
+        "load_snapshots": load_snapshots,
+        "split_player_team": lambda: split_player_team(raw_proj.copy()),
+        "league_points": lambda: league_points(proj_df, {s.league_id: s.league for s in snapshots}),
+        "calculate_dynamic_vorp": lambda: [calculate_dynamic_vorp(proj_df, s.league) for s in snapshots],
+        "assign_grades": lambda: [assign_grades(t) for t in team_scores],
+        "get_draft_grades": lambda: [get_draft_grades(s) for s in snapshots],
+        "calculate_power_scores": lambda: [calculate_power_scores(st, g, s)
+                                           for st, g, s in zip(standings, grades, snapshots)],
+        "get_matchups_with_owners": lambda: [get_matchups_with_owners(s, p) for s, p in zip(snapshots, power)],
+        "get_win_probabilities": lambda: get_win_probabilities(starters),
+        "build_recap": lambda: [build_recap(s.matchups(WEEK - 1), s.roster_to_owner, player_info, player_map, v)
+                                for s, v in zip(snapshots, vorp_dfs)],
+        "evaluate_trades": lambda: evaluate_trades(trade_moves, trade_values, need, player_info["position"]),
+        "get_playoff_odds": lambda: [get_playoff_odds(s, n_sims=10_000, seed=0) for s in snapshots],
+    }
+    results = {name: measure(fn, repeat) for name, fn in cases.items()}
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "functions": results,
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "projection_rows": len(proj_df),
+    }
+
+
+# -------------------------
+# Driver
+# -------------------------
+
+def scenarios(teams, leagues):
+    seen = []
+    for n in teams:
+        seen.append((n, 1))
+    for n in leagues:
+        seen.append((LEAGUE_SIZE, n))
+    return list(dict.fromkeys(seen))
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """Rows where seconds or peak_bytes grew more than `threshold` (and past the noise floors)."""
+    base = {(r["teams"], r["leagues"], r["function"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        b = base.get((r["teams"], r["leagues"], r["function"]))
+        if b is None:
+            continue
+        for metric, floor in (("seconds", TIME_FLOOR), ("peak_bytes", MEMORY_FLOOR)):
+            if r[metric] > b[metric] * (1 + threshold) and r[metric] - b[metric] > floor:
+                regressions.append({**r, "metric": metric, "baseline": b[metric], "ratio": r[metric] / b[metric]})
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--teams", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--leagues", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--output", default=DEFAULT_OUTPUT)
+    ap.add_argument("--baseline", help="results file from an earlier run to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown / memory growth")
+    ap.add_argument("--worker", nargs=2, type=int, metavar=("TEAMS", "LEAGUES"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenario(*args.worker, args.repeat)))
+        return
+
+    results, processes = [], []
+    for n_teams, n_leagues in scenarios(args.teams, args.leagues):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", str(n_teams), str(n_leagues),
+                               "--repeat", str(args.repeat)], capture_output=True, text=True, cwd=ROOT)
+        if proc.returncode != 0:
+            print(proc.stdout + proc.stderr)
+            sys.exit(proc.returncode)
+        out = json.loads(proc.stdout.strip().splitlines()[-1])
+        processes.append({"teams": n_teams, "leagues": n_leagues, "max_rss_bytes": out["max_rss_bytes"],
+                          "projection_rows": out["projection_rows"]})
+        print(f"\nteams={n_teams} leagues={n_leagues}  (projection rows {out['projection_rows']}, "
+              f"peak RSS {out['max_rss_bytes'] / 2**20:.0f} MB)")
+        for name, m in out["functions"].items():
+            results.append({"teams": n_teams, "leagues": n_leagues, "function": name, **m})
+            print(f"  {name:<26} {m['seconds'] * 1000:9.2f} ms  {m['peak_bytes'] / 2**20:8.2f} MB")
+
+    import pandas as pd
+    report = {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "processes": processes,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        for r in regressions:
+            print(f"REGRESSION teams={r['teams']} leagues={r['leagues']} {r['function']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r[r['metric']]:.4g} ({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Peak memory of a /players/nfl refresh: the old resp.json() +
+DataFrame.from_dict(orient="index") path vs the streaming
+player_store.iter_object_items -> players_to_table path.
+
+A synthetic payload shaped like Sleeper's is served from a local HTTP server and
+each path runs in a fresh subprocess; reported memory is the peak RSS growth
+(ru_maxrss) over the process's RSS right before the download.
+
+    python benchmarks/bench_player_ingest.py [--players 11000]
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+
+def synthetic_players(n_players: int, seed: int = 0) -> dict:
+    """A payload with roughly the fields (and size) of api.sleeper.app/v1/players/nfl."""
+    rng = random.Random(seed)
+    positions = ["QB", "RB", "WR", "TE", "K", "DEF", "LB", "DB", "DL", "OL"]
+    teams = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", None]
+    players = {}
+    for i in range(n_players):
+        first, last = f"First{i}", f"Last{i}"
+        pos = rng.choice(positions)
+        players[str(1000 + i)] = {
+            "player_id": str(1000 + i), "first_name": first, "last_name": last, "full_name": f"{first} {last}",
+            "search_first_name": first.lower(), "search_last_name": last.lower(), "search_full_name": f"{first}{last}".lower(),
+            "position": pos, "fantasy_positions": [pos], "team": rng.choice(teams), "status": rng.choice(["Active", "Inactive", None]),
+            "number": rng.randint(0, 99), "depth_chart_position": pos, "depth_chart_order": rng.randint(1, 4),
+            "age": rng.randint(21, 38), "years_exp": rng.randint(0, 15), "height": "72", "weight": "210",
+            "college": "State University", "high_school": "Central High School", "birth_date": "1998-01-01",
+            "birth_city": None, "birth_state": None, "birth_country": None, "hashtag": f"#{first}{last}-NFL-FA-0",
+            "injury_status": rng.choice([None, "Questionable", "Out"]), "injury_body_part": None, "injury_notes": None,
+            "injury_start_date": None, "practice_participation": None, "practice_description": None,
+            "news_updated": rng.randint(1_600_000_000_000, 1_700_000_000_000), "search_rank": rng.randint(1, 9_999_999),
+            "sport": "nfl", "active": True, "team_abbr": None, "team_changed_at": None,
+            "espn_id": rng.randint(1, 5_000_000), "yahoo_id": rng.randint(1, 50_000), "rotowire_id": rng.randint(1, 20_000),
+            "rotoworld_id": None, "sportradar_id": f"{rng.getrandbits(128):032x}", "stats_id": None, "fantasy_data_id": rng.randint(1, 30_000),
+            "gsis_id": None, "swish_id": rng.randint(1, 1_000_000), "oddsjam_id": None, "opta_id": None, "pandascore_id": None,
+            "metadata": {"channel_id": str(rng.getrandbits(60)), "rookie_year": "2020"},
+        }
+    return players
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def run_child(mode: str, url: str):
+    import pandas as pd
+    from player_store import iter_object_items, players_to_table
+    from sleeper_client import http_get
+
+    http_get(url.rsplit("/", 1)[0] + "/warmup").raise_for_status()
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "old":
+        resp = http_get(url)
+        resp.raise_for_status()
+        data = resp.json()
+        player_df = pd.DataFrame.from_dict(data, orient="index")
+        player_df = player_df[['full_name']]
+        player_df.reset_index(inplace=True)
+        result = dict(zip(player_df["index"], player_df["full_name"]))
+    else:
+        with http_get(url, stream=True) as resp:
+            resp.raise_for_status()
+            result = players_to_table(iter_object_items(resp.iter_content(chunk_size=64 * 1024)))
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"players": len(result), "seconds": seconds, "peak_growth_mb": (peak_kb - baseline_kb) / 1024}))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=11000)
+    ap.add_argument("--child", nargs=2, metavar=("MODE", "URL"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return run_child(*args.child)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "nfl"), "w") as f:
+            json.dump(synthetic_players(args.players), f)
+        with open(os.path.join(tmp, "warmup"), "w") as f:
+            f.write("{}")
+        size_mb = os.path.getsize(os.path.join(tmp, "nfl")) / 1024 / 1024
+
+        handler = functools.partial(QuietHandler, directory=tmp)
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/nfl"
+
+        print(f"payload: {args.players} players, {size_mb:.1f} MB")
+        for mode, label in (("old", "resp.json + from_dict"), ("new", "streaming -> arrow")):
+            out = subprocess.run([sys.executable, __file__, "--child", mode, url], capture_output=True, text=True, check=True)
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{label:>24}: peak RSS +{r['peak_growth_mb']:.1f} MB, {r['seconds'] * 1000:.0f} ms, {r['players']} players")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
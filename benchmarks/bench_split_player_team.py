@@ -0,0 +1,89 @@
+"""
+split_player_team: the old per-row .apply(parse_name_team) vs the vectorized
+str-accessor version in utils, on a large synthetic projection frame.
+Also checks the two produce identical Player/Team columns (exits non-zero if not).
+
+    python benchmarks/bench_split_player_team.py [--rows 20000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+from benchmarks.synthetic import NFL_TEAMS, player_name
+from utils import split_player_team
+
+# Names the old parser treats specially: suffixes, no team, odd spacing, lower-case team
+EDGE_CASES = [
+    "Patrick Mahomes II KC", "Odell Beckham Jr", "Kenneth Walker III", "Michael Pittman Jr. IND",
+    "Single", "  Lead  Space  sf ", "", "Jr KC", "A B", "Amon-Ra St. Brown DET", "DJ Moore",
+    "Brian Thomas Jr.", "X V", "Buffalo Bills BUF", "Name\tTab NYJ",
+]
+
+
+def legacy_split_player_team(proj_df: pd.DataFrame):
+    """The pre-vectorization implementation, kept as the reference behaviour."""
+    suffixes = {"Jr", "Jr.", "II", "III", "IV", "V"}
+
+    def parse_name_team(s):
+        tokens = s.strip().split()
+        if len(tokens) < 2:
+            return pd.Series([s, None])
+        last_token = tokens[-1].upper()
+        if re.fullmatch(r'^[A-Z]{2,3}$', last_token):
+            team = last_token
+            name_tokens = tokens[:-1]
+        else:
+            team = None
+            name_tokens = tokens
+        if name_tokens[-1] in suffixes:
+            name_tokens = name_tokens[:-1]
+        return pd.Series([" ".join(name_tokens), team])
+
+    proj_df[['Player', 'Team']] = proj_df['Player'].apply(parse_name_team)
+    return proj_df
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    names = [f"{player_name(pos, i)} {NFL_TEAMS[i % len(NFL_TEAMS)]}"
+             for i in range(n_rows // 4) for pos in ("qb", "rb", "wr", "te")]
+    names += EDGE_CASES
+    return pd.DataFrame({"Player": names, "FPTS": range(len(names))})
+
+
+def timed(fn, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        out = fn(frame)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    df = make_frame(args.rows)
+    old_s, old_df = timed(legacy_split_player_team, df, args.repeat)
+    new_s, new_df = timed(split_player_team, df, args.repeat)
+
+    same = old_df[["Player", "Team"]].equals(new_df[["Player", "Team"]])
+    print(f"rows={len(df)}  apply: {old_s * 1000:.1f} ms  vectorized: {new_s * 1000:.1f} ms  "
+          f"speedup: {old_s / new_s:.1f}x  identical: {same}")
+    if not same:
+        diff = old_df[["Player", "Team"]].compare(new_df[["Player", "Team"]])
+        print(diff.head(20).to_string())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Game-day load test: N simulated Streamlit sessions opening each page at once.
+
+A local stub server stands in for the Sleeper API, FantasyPros projection pages
+and FantasyCalc values (synthetic data from benchmarks/synthetic.py, optional
+injected latency); the app is pointed at it through the SWISH_*_BASE_URL
+settings. Each session runs a page script with streamlit.testing's AppTest, in
+this process, so sessions share module-level caches the way they do in one
+Streamlit server.
+
+Per page it reports throughput, session latency percentiles, errors, the
+upstream requests the sessions caused (by upstream) and process memory.
+
+    python benchmarks/load_test.py [--sessions 40] [--concurrency 8] [--latency-ms 50]
+    python benchmarks/load_test.py --pages "Power Rankings" "Matchup Previews" --cold --output load.json
+
+By default the snapshot refresher runs once before the sessions start (as it
+would have on a running server); --cold starts from empty caches instead and
+lets the in-process refresher race the sessions.
+"""
+import argparse
+import collections
+import glob
+import http.server
+import json
+import logging
+import os
+import re
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+from benchmarks.synthetic import (
+    POSITIONS, fantasycalc_values, fantasypros_page, sleeper_league, sleeper_players, sleeper_transactions
+)
+
+WEEK = 6
+
+
+# -------------------------
+# Stub upstream server
+# -------------------------
+
+class StubUpstreams:
+    """Synthetic Sleeper / FantasyPros / FantasyCalc responses, built lazily and counted."""
+
+    def __init__(self, n_teams: int = 12, latency: float = 0.0):
+        self.n_teams = n_teams
+        self.latency = latency
+        self.players = sleeper_players(150)
+        self.counts = collections.Counter()
+        self._bodies = {}
+        self._leagues = {}
+        self._lock = threading.Lock()
+
+    def _league(self, league_id: str) -> dict:
+        with self._lock:
+            if league_id not in self._leagues:
+                seed = int(league_id) % 10_000 if league_id.isdigit() else 0
+                self._leagues[league_id] = sleeper_league(league_id, self.n_teams, self.players, week=WEEK, seed=seed)
+            return self._leagues[league_id]
+
+    def _payload(self, path: str, query: str):
+        """(upstream, route, body) for a request path, or None for unknown paths."""
+        m = re.fullmatch(r"/nfl/projections/(\w+)\.php", path)
+        if m:
+            position = m.group(1)
+            seed = POSITIONS.index(position) if position in POSITIONS else 0
+            return "fantasypros", "projections", fantasypros_page(position, n_players=150, seed=seed)
+        if path == "/values/current":
+            return "fantasycalc", "values", fantasycalc_values(self.players)
+        if not path.startswith("/v1/"):
+            return None
+
+        sleeper_path = path[len("/v1/"):]
+        parts = sleeper_path.split("/")
+        if sleeper_path == "players/nfl":
+            return "sleeper", "players/nfl", self.players
+        if parts[0] == "draft":
+            league_id = parts[1][1:]  # draft ids are "d<league_id>"
+            return "sleeper", "draft/picks", self._league(league_id).get(sleeper_path, [])
+        if parts[0] == "league" and len(parts) >= 2:
+            league = self._league(parts[1])
+            route = "/".join(["league"] + parts[2:3])
+            if len(parts) >= 3 and parts[2] == "transactions":
+                week = int(parts[3]) if len(parts) > 3 else 1
+                return "sleeper", route, sleeper_transactions(parts[1], self.n_teams, self.players, week)
+            if len(parts) == 4 and parts[2] == "matchups":
+                # Playoff weeks (past the synthetic regular season) have no pairings yet
+                return "sleeper", route, league.get(sleeper_path, [])
+            if sleeper_path in league:
+                return "sleeper", route, league[sleeper_path]
+        return None
+
+    def get(self, path: str, query: str):
+        """(status, content type, body bytes) for one request."""
+        if self.latency:
+            time.sleep(self.latency)
+        key = f"{path}?{query}"
+        with self._lock:
+            cached = self._bodies.get(key)
+        if cached is None:
+            found = self._payload(path, query)
+            if found is None:
+                with self._lock:
+                    self.counts[("unknown", path)] += 1
+                return 404, "application/json", b'{"error": "not found"}'
+            upstream, route, payload = found
+            if isinstance(payload, str):
+                cached = (upstream, route, "text/html; charset=utf-8", payload.encode())
+            else:
+                cached = (upstream, route, "application/json", json.dumps(payload).encode())
+            with self._lock:
+                self._bodies[key] = cached
+        upstream, route, content_type, body = cached
+        with self._lock:
+            self.counts[(upstream, route)] += 1
+        return 200, content_type, body
+
+    def snapshot_counts(self) -> collections.Counter:
+        with self._lock:
+            return collections.Counter(self.counts)
+
+
+def serve(stub: StubUpstreams) -> http.server.ThreadingHTTPServer:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            status, content_type, body = stub.get(parts.path, parts.query)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-upstreams", daemon=True).start()
+    return server
+
+
+# -------------------------
+# Sessions
+# -------------------------
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux), else 0."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def page_files(names) -> dict:
+    files = {"Standings": os.path.join(ROOT, "streamlit_app.py")}
+    for path in sorted(glob.glob(os.path.join(ROOT, "pages", "*.py"))):
+        files[os.path.basename(path)[:-3].split("_", 2)[2].replace("_", " ")] = path
+    if names:
+        files = {name: path for name, path in files.items() if name in names}
+    return files
+
+
+def allow_concurrent_apptests():
+    """
+    AppTest installs a mock Runtime singleton for each run and clears it when the
+    run ends, which breaks runs that overlap. Fall back to the last installed
+    mock, so every concurrent session still finds a runtime. Script compilation
+    (ast.parse) is not safe to run concurrently, so it is serialized.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    original = Runtime.instance.__func__
+    get_bytecode = ScriptCache.get_bytecode
+    compile_lock = threading.Lock()
+
+    def locked_get_bytecode(self, script_path):
+        with compile_lock:
+            return get_bytecode(self, script_path)
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+            return cls._instance
+        return last["runtime"] if last else original(cls)
+
+    Runtime.instance = classmethod(instance)
+    ScriptCache.get_bytecode = locked_get_bytecode
+    # Page errors are summarized per page; Streamlit's own tracebacks are noise here
+    logging.disable(logging.ERROR)
+
+
+def run_session(path: str, timeout: float) -> tuple:
+    """(seconds, error message or None) for one page render."""
+    from streamlit.testing.v1 import AppTest
+    start = time.perf_counter()
+    try:
+        at = AppTest.from_file(path, default_timeout=timeout).run()
+        error = at.exception[0].message if len(at.exception) else None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, error
+
+
+def percentile(values, q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def run_page(stub: StubUpstreams, name: str, path: str, sessions: int, concurrency: int, timeout: float) -> dict:
+    before = stub.snapshot_counts()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: run_session(path, timeout), range(sessions)))
+    elapsed = time.perf_counter() - start
+    upstream = stub.snapshot_counts() - before
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    errors = collections.Counter(r[1] for r in results if r[1])
+    by_upstream = collections.Counter()
+    for (host, _), n in upstream.items():
+        by_upstream[host] += n
+    return {
+        "page": name,
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "throughput": sessions / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1],
+        "errors": sum(errors.values()),
+        "error_messages": dict(errors),
+        "upstream_requests": sum(upstream.values()),
+        "upstream_by_host": dict(by_upstream),
+        "upstream_by_route": {f"{h} {r}": n for (h, r), n in sorted(upstream.items())},
+        "rss_mb": rss_bytes() / 2**20,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=40, help="sessions per page")
+    ap.add_argument("--concurrency", type=int, default=8, help="sessions rendering at the same time")
+    ap.add_argument("--pages", nargs="+", help="page names (default: every page)")
+    ap.add_argument("--latency-ms", type=float, default=50, help="added to every upstream response")
+    ap.add_argument("--teams", type=int, default=12)
+    ap.add_argument("--cold", action="store_true", help="start from empty caches, without a pre-built snapshot")
+    ap.add_argument("--timeout", type=float, default=120, help="per-render timeout (seconds)")
+    ap.add_argument("--output", help="write the report as JSON")
+    args = ap.parse_args()
+
+    stub = StubUpstreams(n_teams=args.teams, latency=args.latency_ms / 1000)
+    server = serve(stub)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    workdir = tempfile.mkdtemp(prefix="swish-load-")
+    # Read by the repo modules at import time
+    os.environ.update({
+        "SWISH_SLEEPER_BASE_URL": f"{base}/v1",
+        "SWISH_FANTASYPROS_BASE_URL": base,
+        "SWISH_FANTASYCALC_BASE_URL": base,
+        "SWISH_CACHE_DIR": os.path.join(workdir, "cache"),
+        "SWISH_HTTP_MODE": "live",
+    })
+    if not args.cold:
+        os.environ["SWISH_REFRESHER"] = "external"
+
+    allow_concurrent_apptests()
+    report = {"args": vars(args), "pages": []}
+    try:
+        if not args.cold:
+            import refresher
+            start = time.perf_counter()
+            refresher.refresh_leagues()
+            report["prebuild"] = {"seconds": time.perf_counter() - start,
+                                  "upstream_requests": sum(stub.snapshot_counts().values())}
+            print(f"Snapshot pre-build: {report['prebuild']['seconds']:.2f} s, "
+                  f"{report['prebuild']['upstream_requests']} upstream requests")
+
+        header = f"{'page':<18} {'sess/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>6} {'upstream':>8}  by upstream"
+        print(header)
+        for name, path in page_files(args.pages).items():
+            row = run_page(stub, name, path, args.sessions, args.concurrency, args.timeout)
+            report["pages"].append(row)
+            print(f"{name:<18} {row['throughput']:7.1f} {row['p50_ms']:8.0f} {row['p95_ms']:8.0f} {row['p99_ms']:8.0f} "
+                  f"{row['max_ms']:8.0f} {row['errors']:6d} {row['upstream_requests']:8d}  {row['upstream_by_host']}")
+            for message, n in row["error_messages"].items():
+                print(f"    {n} x {message[:120]}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Process peak RSS: {report['peak_rss_mb']:.0f} MB")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import random
+
+# -------------------------
+# Synthetic FantasyPros pages for offline benchmarks
+# -------------------------
+
+FP_COLUMNS = {
+    "qb": [("PASSING", ["ATT", "CMP", "YDS", "TDS", "INTS"]), ("RUSHING", ["ATT", "YDS", "TDS"]), ("MISC", ["FL", "FPTS"])],
+    "rb": [("RUSHING", ["ATT", "YDS", "TDS"]), ("RECEIVING", ["REC", "YDS", "TDS"]), ("MISC", ["FL", "FPTS"])],
+    "wr": [("RECEIVING", ["REC", "YDS", "TDS"]), ("RUSHING", ["ATT", "YDS", "TDS"]), ("MISC", ["FL", "FPTS"])],
+    "te": [("RECEIVING", ["REC", "YDS", "TDS"]), ("MISC", ["FL", "FPTS"])],
+    "k": [(None, ["FG", "FGA", "XPT", "FPTS"])],
+    "dst": [(None, ["SACK", "INT", "FR", "FF", "TD", "SAFETY", "PA", "YDS AGN", "FPTS"])],
+}
+
+NFL_TEAMS = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB",
+             "HOU", "IND", "JAC", "KC", "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+             "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS"]
+SUFFIXES = ["", "", "", "", " Jr.", " II", " III"]
+
+
+def player_name(position: str, i: int) -> str:
+    return f"{position.upper()}player{i} Surname{i}{SUFFIXES[i % len(SUFFIXES)]}"
+
+
+def fantasypros_page(position: str, n_players: int = 150, seed: int = 0) -> str:
+    """A page shaped like fantasypros.com/nfl/projections/{position}.php (nav, filler tables, data table)."""
+    rng = random.Random(seed)
+    groups = FP_COLUMNS[position]
+    n_stats = sum(len(stats) for _, stats in groups)
+
+    head = "<thead>"
+    if groups[0][0] is not None:
+        head += "<tr><th></th>" + "".join(f'<th colspan="{len(stats)}"><b>{g}</b></th>' for g, stats in groups) + "</tr>"
+    head += "<tr><th>Player</th>" + "".join(f"<th><small>{s}</small></th>" for _, stats in groups for s in stats) + "</tr></thead>"
+
+    rows = []
+    for i in range(n_players):
+        team = NFL_TEAMS[i % len(NFL_TEAMS)]
+        stats = "".join(f'<td class="center">{rng.uniform(0, 5000 / (i + 5)):,.1f}</td>' for _ in range(n_stats))
+        rows.append(
+            f'<tr class="mpb-player-{10000 + i}"><td class="player-label">'
+            f'<a href="/nfl/players/p{i}.php" class="player-name">{player_name(position, i)}</a> {team} '
+            f'<a href="#" class="fp-player-link fp-id-{i}" fp-player-name="p{i}"></a></td>{stats}</tr>'
+        )
+
+    nav = "".join(f'<li><a href="/nfl/{t.lower()}">{t}</a></li>' for t in NFL_TEAMS) * 20
+    filler = "<table class=\"promo\"><tr><td>Sponsored</td><td>Links</td></tr></table>" * 10
+    script = "<script>var x = {" + ",".join(f'"k{i}": {i}' for i in range(2000)) + "};</script>"
+    return (
+        f"<!DOCTYPE html><html><head><title>{position.upper()} projections</title>{script}</head><body>"
+        f"<nav><ul>{nav}</ul></nav>"
+        f'<table id="data" class="table table-bordered">{head}<tbody>{"".join(rows)}</tbody></table>'
+        f"{filler}<footer>{nav}</footer></body></html>"
+    )
+
+
+# -------------------------
+# Synthetic Sleeper leagues
+# -------------------------
+
+POSITIONS = ["qb", "rb", "wr", "te", "k", "dst"]
+ROSTER_POSITIONS = ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "FLEX", "K", "DEF"] + ["BN"] * 6
+REGULAR_SEASON_WEEKS = 14
+SCORING_SETTINGS = {"pass_yd": 0.04, "pass_td": 4, "pass_int": -1, "rush_yd": 0.1, "rush_td": 6,
+                    "rec": 1, "rec_yd": 0.1, "rec_td": 6, "fum_lost": -2}
+
+
+def sleeper_players(n_per_position: int = 150) -> dict:
+    """A /players/nfl payload whose names line up with fantasypros_page(position, n_per_position)."""
+    players = {}
+    for position in POSITIONS:
+        for i in range(n_per_position):
+            player_id = f"{position}{i}"
+            players[player_id] = {
+                "player_id": player_id,
+                "full_name": player_name(position, i),
+                "position": "DEF" if position == "dst" else position.upper(),
+                "team": NFL_TEAMS[i % len(NFL_TEAMS)],
+                "status": "Active",
+            }
+    return players
+
+
+def round_robin(n_teams: int, n_weeks: int) -> list:
+    """Weekly pairings of roster ids 1..n_teams (circle method); an odd team out has a bye."""
+    slots = list(range(1, n_teams + 1)) + ([None] if n_teams % 2 else [])
+    weeks = []
+    for _ in range(n_weeks):
+        half = len(slots) // 2
+        weeks.append([(a, b) for a, b in zip(slots[:half], reversed(slots[half:])) if a and b])
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return weeks
+
+
+def sleeper_league(league_id: str, n_teams: int, players: dict, week: int = 6, seed: int = 0) -> dict:
+    """
+    Sleeper API payloads for one league, keyed by path (league/{id}, .../users,
+    .../rosters, .../drafts, draft/{id}/picks, .../matchups/{w} for every
+    regular-season week; weeks after `week` have pairings but no points yet).
+    Rosters deal len(ROSTER_POSITIONS) players per team round-robin from `players`.
+    """
+    rng = random.Random(seed)
+    player_ids = list(players)
+    per_team = len(ROSTER_POSITIONS)
+    draft_id = f"d{league_id}"
+
+    users, rosters, picks = [], [], []
+    for roster_id in range(1, n_teams + 1):
+        user_id = f"{league_id}-u{roster_id}"
+        users.append({"user_id": user_id, "display_name": f"Owner{roster_id}"})
+        roster = [player_ids[((roster_id - 1) + n_teams * r) % len(player_ids)] for r in range(per_team)]
+        wins = rng.randint(0, week - 1)
+        rosters.append({
+            "roster_id": roster_id, "owner_id": user_id, "players": roster,
+            "settings": {"wins": wins, "losses": week - 1 - wins,
+                         "fpts": rng.randint(400, 900), "fpts_against": rng.randint(400, 900)},
+        })
+
+    # Snake draft in roster order
+    for r in range(per_team):
+        order = range(1, n_teams + 1) if r % 2 == 0 else range(n_teams, 0, -1)
+        for roster_id in order:
+            player_id = rosters[roster_id - 1]["players"][r]
+            first, _, last = players[player_id]["full_name"].partition(" ")
+            picks.append({"roster_id": roster_id, "player_id": player_id, "pick_no": len(picks) + 1, "round": r + 1,
+                          "metadata": {"first_name": first, "last_name": last,
+                                       "position": players[player_id]["position"]}})
+
+    matchups = {}
+    for w, pairs in enumerate(round_robin(n_teams, REGULAR_SEASON_WEEKS), 1):
+        matchup_id = {roster_id: m for m, pair in enumerate(pairs, 1) for roster_id in pair}
+        rows = []
+        for roster in rosters:
+            players_points = {p: round(rng.uniform(0, 30), 2) for p in roster["players"]} if w <= week else {}
+            starters = roster["players"][:10]
+            rows.append({"roster_id": roster["roster_id"], "matchup_id": matchup_id.get(roster["roster_id"]),
+                         "starters": starters, "players": roster["players"],
+                         "points": round(sum(players_points.get(p, 0) for p in starters), 2),
+                         "players_points": players_points})
+        matchups[f"league/{league_id}/matchups/{w}"] = rows
+
+    league = {
+        "league_id": league_id, "name": f"Synthetic {league_id}", "total_rosters": n_teams,
+        "roster_positions": ROSTER_POSITIONS, "scoring_settings": SCORING_SETTINGS,
+        "settings": {"leg": week, "season_length": REGULAR_SEASON_WEEKS, "playoff_teams": 6,
+                     "playoff_week_start": REGULAR_SEASON_WEEKS + 1},
+    }
+    return {
+        f"league/{league_id}": league,
+        f"league/{league_id}/users": users,
+        f"league/{league_id}/rosters": rosters,
+        f"league/{league_id}/drafts": [{"draft_id": draft_id, "start_time": 1725000000000}],
+        f"draft/{draft_id}/picks": picks,
+        **matchups,
+    }
+
+
+def sleeper_transactions(league_id: str, n_teams: int, players: dict, week: int, n_trades: int = 3, seed: int = 0) -> list:
+    """A league/{id}/transactions/{week} payload: a few two-team trades plus a waiver add."""
+    rng = random.Random(f"{league_id}-{week}-{seed}")
+    player_ids = list(players)
+    transactions = []
+    for k in range(n_trades):
+        a, b = rng.sample(range(1, n_teams + 1), 2)
+        sent, received = rng.sample(player_ids, 2)
+        transactions.append({
+            "transaction_id": f"{league_id}{week:02d}{k:03d}", "type": "trade", "status": "complete", "leg": week,
+            "roster_ids": [a, b], "adds": {sent: b, received: a}, "drops": {sent: a, received: b},
+            "created": 1_725_000_000_000 + week * 604_800_000 + k * 1000,
+        })
+    transactions.append({
+        "transaction_id": f"{league_id}{week:02d}999", "type": "waiver", "status": "complete", "leg": week,
+        "roster_ids": [1], "adds": {rng.choice(player_ids): 1}, "drops": None,
+        "created": 1_725_000_000_000 + week * 604_800_000 + 999_000,
+    })
+    return transactions
+
+
+def fantasycalc_values(players: dict, seed: int = 0) -> list:
+    """An api.fantasycalc.com/values/current payload for `players`."""
+    rng = random.Random(seed)
+    values = []
+    for i, (player_id, p) in enumerate(players.items()):
+        values.append({
+            "player": {"id": 10_000 + i, "name": p["full_name"], "sleeperId": player_id,
+                       "position": p["position"], "maybeTeam": p["team"]},
+            "value": rng.randint(100, 10_000),
+        })
+    values.sort(key=lambda v: v["value"], reverse=True)
+    for rank, v in enumerate(values, 1):
+        v["overallRank"] = rank
+    return values
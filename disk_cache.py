@@ -0,0 +1,95 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+
+from instrumentation import note_cache
+
+# -------------------------
+# Disk-backed TTL / LRU cache
+# -------------------------
+
+CACHE_DIR = os.environ.get("SWISH_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+
+class DiskCache:
+    """
+    Pickle-per-key cache shared by every Streamlit session in (and across) processes.
+
+    - entries older than `ttl` seconds are treated as missing
+    - writes go to a temp file + os.replace, so readers never see a partial file
+    - a file's mtime is bumped on read; once the directory grows past
+      `max_bytes`, least-recently-used files are evicted first
+    """
+
+    def __init__(self, name: str, ttl: float, max_bytes: int = 64 * 1024 * 1024, directory: str = CACHE_DIR):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pkl")
+
+    def get(self, key, default=None, max_age: float = None):
+        """The cached value, or `default` if missing or older than `max_age` (default: the ttl)."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                written_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            note_cache(False)
+            return default
+        if time.time() - written_at > (self.ttl if max_age is None else max_age):
+            note_cache(False)
+            return default
+        note_cache(True)
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def get_or_set(self, key, compute):
+        """Return the fresh cached value for `key`, or compute, store and return it."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".pkl"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
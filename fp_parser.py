@@ -0,0 +1,136 @@
+from html.parser import HTMLParser
+
+import pandas as pd
+
+from instrumentation import traced
+
+# -------------------------
+# FantasyPros projections table parser
+# -------------------------
+# FantasyPros projection pages render one stats table (<table id="data">) with
+# either one header row (K, DST) or a group row + stat row (QB/RB/WR/TE):
+#
+#   |        | PASSING          | RUSHING   | MISC     |
+#   | Player | ATT | CMP | ...  | ATT | ... | FL | FPTS |
+#
+# pd.read_html(flavor="html5lib") builds a DOM for the whole page and a frame for
+# every table on it. This walks the markup once, keeps only the projections
+# table, and stops as soon as that table closes.
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _ProjectionTableParser(HTMLParser):
+
+    def __init__(self, table_id):
+        super().__init__(convert_charrefs=True)
+        self.table_id = table_id
+        self.in_table = False
+        self.depth = 0  # nested <table> depth inside the target table
+        self.in_thead = False
+        self.header_rows = []  # [[(text, colspan), ...], ...]
+        self.rows = []  # [[text, ...], ...]
+        self._row = None
+        self._row_is_header = False
+        self._cell = None
+        self._colspan = 1
+
+    def handle_starttag(self, tag, attrs):
+        if not self.in_table:
+            if tag == "table" and (self.table_id is None or dict(attrs).get("id") == self.table_id):
+                self.in_table = True
+            return
+        if tag == "table":
+            self.depth += 1
+        elif self.depth:
+            return
+        elif tag == "thead":
+            self.in_thead = True
+        elif tag == "tr":
+            self._row = []
+            self._row_is_header = True
+        elif tag in ("td", "th"):
+            self._row_is_header = self._row_is_header and tag == "th"
+            self._cell = []
+            colspan = dict(attrs).get("colspan") or "1"
+            self._colspan = int(colspan) if colspan.isdigit() else 1
+
+    def handle_endtag(self, tag):
+        if not self.in_table:
+            return
+        if tag == "table":
+            if self.depth:
+                self.depth -= 1
+                return
+            raise _StopParsing
+        if self.depth:
+            return
+        if tag == "thead":
+            self.in_thead = False
+        elif tag in ("td", "th") and self._cell is not None and self._row is not None:
+            self._row.append((" ".join("".join(self._cell).split()), self._colspan))
+            self._cell = None
+        elif tag == "tr" and self._row:
+            # Header rows: anything in <thead>, or <th>-only rows before the first data row
+            if self.in_thead or (self._row_is_header and not self.rows):
+                self.header_rows.append(self._row)
+            else:
+                self.rows.append([text for text, _ in self._row])
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None and not self.depth:
+            self._cell.append(data)
+
+
+def _column_names(header_rows, n_cols):
+    """Flatten the group + stat header rows the way the old MultiIndex flattening did."""
+    if not header_rows:
+        return [f"col_{i}" for i in range(n_cols)]
+
+    expanded = []
+    for row in header_rows:
+        labels = []
+        for text, colspan in row:
+            labels.extend([text] * colspan)
+        expanded.append(labels)
+
+    names = []
+    for i in range(len(expanded[-1])):
+        parts = [labels[i] for labels in expanded if i < len(labels) and labels[i]]
+        names.append("_".join(dict.fromkeys(parts)))
+    return names
+
+
+@traced
+def parse_projections_table(html: str, table_id="data") -> pd.DataFrame:
+    """
+    Extract the FantasyPros projections table from a page.
+
+    Returns 'Player' (raw "Name TEAM" cell text) followed by the stat columns
+    (e.g. PASSING_YDS, RUSHING_TDS, FPTS) already converted to floats.
+    """
+    parser = _ProjectionTableParser(table_id)
+    try:
+        parser.feed(html)
+        parser.close()
+    except _StopParsing:
+        pass
+    if table_id is not None and not parser.in_table:
+        # Page without the usual id -- fall back to its first table
+        return parse_projections_table(html, table_id=None)
+    if not parser.rows:
+        return pd.DataFrame()
+
+    n_cols = max(len(r) for r in parser.rows)
+    names = _column_names(parser.header_rows, n_cols)[:n_cols]
+    names += [f"col_{i}" for i in range(len(names), n_cols)]
+    names = ["Player"] + ["FPTS" if n == "FPTS" or n.endswith("_FPTS") else n for n in names[1:]]
+
+    rows = [r + [""] * (n_cols - len(r)) for r in parser.rows]
+    df = pd.DataFrame(rows, columns=names)
+    stat_cols = names[1:]
+    df[stat_cols] = df[stat_cols].apply(lambda col: pd.to_numeric(col.str.replace(",", "", regex=False), errors="coerce"))
+    return df
@@ -0,0 +1,168 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from disk_cache import CACHE_DIR
+
+# -------------------------
+# HTTP record / replay
+# -------------------------
+# Every upstream GET (Sleeper, FantasyPros, FantasyCalc) goes through
+# sleeper_client.http_get, which consults this store according to SWISH_HTTP_MODE:
+#
+#   live    (default) straight to the network
+#   record  go to the network and save every response
+#   replay  serve saved responses only; a request that was never recorded fails
+#
+# Layout under SWISH_REPLAY_DIR (default .cache/replay):
+#
+#   requests/<sha1 of "GET url?sorted-params">.json   status, headers, blob, elapsed
+#   blobs/<sha256 of body>                            response bodies, deduplicated
+#
+# SWISH_REPLAY_LATENCY adds a delay to every replayed response: a number of
+# seconds, or "recorded" to wait as long as the original response took.
+
+HTTP_MODES = ("live", "record", "replay")
+HTTP_MODE = os.environ.get("SWISH_HTTP_MODE", "live").lower()
+REPLAY_DIR = os.environ.get("SWISH_REPLAY_DIR", os.path.join(CACHE_DIR, "replay"))
+REPLAY_LATENCY = os.environ.get("SWISH_REPLAY_LATENCY", "0")
+
+# Response headers worth replaying; the rest (dates, cookies, CDN ids) only add
+# noise. Bodies are stored decoded, so Content-Encoding is dropped too.
+KEPT_HEADERS = ("content-type", "etag", "last-modified", "retry-after")
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ReplayMissError(requests.ConnectionError):
+    """Replay mode was asked for a request that was never recorded."""
+
+
+def request_key(url: str, params=None) -> str:
+    """Canonical request identity: GET + URL with its query parameters sorted."""
+    prepared = requests.Request("GET", url, params=params).prepare()
+    base, _, query = prepared.url.partition("?")
+    return "GET " + base + ("?" + "&".join(sorted(query.split("&"))) if query else "")
+
+
+class ReplayStore:
+    """Content-addressed store of recorded GET responses."""
+
+    def __init__(self, directory: str = REPLAY_DIR, latency=REPLAY_LATENCY):
+        self.directory = directory
+        self.latency = latency
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.request_dir = os.path.join(directory, "requests")
+
+    def _request_path(self, key: str) -> str:
+        return os.path.join(self.request_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _write_atomic(self, path: str, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                result = write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return result
+
+    def record(self, url: str, params, resp: requests.Response, stream: bool = False) -> requests.Response:
+        """
+        Save a live response and return an equivalent replayed one. The body is
+        copied chunk by chunk, so recording a streamed download stays streamed.
+        """
+        os.makedirs(self.blob_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, suffix=".tmp")
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f, resp:
+                for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+            blob = digest.hexdigest()
+            os.replace(tmp_path, os.path.join(self.blob_dir, blob))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        key = request_key(url, params)
+        entry = {
+            "request": key,
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "url": resp.url,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() in KEPT_HEADERS},
+            "encoding": resp.encoding,
+            "elapsed": resp.elapsed.total_seconds(),
+            "blob": blob,
+            "recorded_at": time.time(),
+        }
+        self._write_atomic(self._request_path(key), lambda f: f.write(json.dumps(entry, indent=1).encode()))
+        return self._response(entry, stream)
+
+    def put(self, url: str, content: bytes, params=None, status: int = 200,
+            content_type: str = "application/json") -> requests.Response:
+        """Store a response body for `url` directly (fixtures for benchmarks and offline runs)."""
+        resp = requests.Response()
+        resp.status_code, resp.url, resp.encoding = status, url, "utf-8"
+        resp.headers["Content-Type"] = content_type
+        resp.raw = io.BytesIO(content)
+        return self.record(url, params, resp)
+
+    def replay(self, url: str, params=None, stream: bool = False) -> requests.Response:
+        """The recorded response for this request; raises ReplayMissError if there is none."""
+        key = request_key(url, params)
+        try:
+            with open(self._request_path(key)) as f:
+                entry = json.load(f)
+        except OSError:
+            raise ReplayMissError(f"No recorded response for {key}") from None
+
+        delay = entry["elapsed"] if self.latency == "recorded" else float(self.latency or 0)
+        if delay > 0:
+            time.sleep(delay)
+        return self._response(entry, stream)
+
+    def _response(self, entry: dict, stream: bool) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.reason = entry.get("reason")
+        resp.url = entry["url"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp.encoding = entry.get("encoding")
+        resp.elapsed = timedelta(seconds=entry["elapsed"])
+        # The blob file is the body stream: iter_content reads it chunk by chunk,
+        # .content reads it whole
+        resp.raw = open(os.path.join(self.blob_dir, entry["blob"]), "rb")
+        if not stream:
+            resp.content  # read the body and release the file
+            resp.raw.close()
+        return resp
+
+
+_store = ReplayStore()
+
+
+def get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """session.get, routed through the replay store according to HTTP_MODE."""
+    if HTTP_MODE not in HTTP_MODES:
+        raise ValueError(f"SWISH_HTTP_MODE must be one of {HTTP_MODES}, got {HTTP_MODE!r}")
+    params, stream = kwargs.get("params"), kwargs.get("stream", False)
+    if HTTP_MODE == "replay":
+        return _store.replay(url, params, stream)
+    resp = session.get(url, **kwargs)
+    if HTTP_MODE == "record":
+        return _store.record(url, params, resp, stream)
+    return resp
@@ -0,0 +1,212 @@
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# -------------------------
+# Timing spans
+# -------------------------
+# A span times one stage -- an HTTP call, a utils compute function, a chart --
+# and carries bytes received and disk-cache hits / misses seen inside it.
+# Pages call start_render() at the top and finish_render() at the bottom; every
+# span in between (including ones on the Sleeper worker threads) is collected
+# for that render and summarised in an optional debug sidebar panel
+# (SWISH_DEBUG=1 or ?debug=1 in the URL).
+#
+# With SWISH_TRACE_FILE set, every span and a per-render summary are appended
+# to that file as JSON lines; `python instrumentation.py <file>` prints
+# p50 / p95 per stage.
+
+TRACE_FILE = os.environ.get("SWISH_TRACE_FILE")
+DEBUG = os.environ.get("SWISH_DEBUG") == "1"
+
+_current_render = contextvars.ContextVar("render", default=None)
+_current_span = contextvars.ContextVar("span", default=None)
+_write_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "kind", "parent", "seconds", "bytes", "cache_hits", "cache_misses", "attrs")
+
+    def __init__(self, name: str, kind: str, parent: str = None, attrs: dict = None):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.seconds = 0.0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.attrs = attrs or {}
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "kind": self.kind, "parent": self.parent, "seconds": self.seconds,
+                "bytes": self.bytes, "cache_hits": self.cache_hits, "cache_misses": self.cache_misses, **self.attrs}
+
+
+class Render:
+    """The spans of one page render."""
+
+    def __init__(self, page: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.page = page
+        self.started = time.perf_counter()
+        self.spans = []  # appended from worker threads too (list.append is atomic)
+
+    def summary(self) -> list:
+        """Per-stage totals: name, kind, calls, seconds, bytes, cache hits / misses."""
+        stages = {}
+        for s in self.spans:
+            row = stages.setdefault(s.name, {"stage": s.name, "kind": s.kind, "calls": 0, "seconds": 0.0,
+                                             "bytes": 0, "cache_hits": 0, "cache_misses": 0})
+            row["calls"] += 1
+            row["seconds"] += s.seconds
+            row["bytes"] += s.bytes
+            row["cache_hits"] += s.cache_hits
+            row["cache_misses"] += s.cache_misses
+        return sorted(stages.values(), key=lambda r: r["seconds"], reverse=True)
+
+
+def _export(record: dict):
+    if not TRACE_FILE:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        with open(TRACE_FILE, "a") as f:
+            f.write(line)
+
+
+@contextmanager
+def span(name: str, kind: str = "compute", **attrs):
+    """Time the enclosed block as one stage; yields the Span so callers can add bytes / attrs."""
+    parent = _current_span.get()
+    s = Span(name, kind, parent.name if parent else None, attrs)
+    token = _current_span.set(s)
+    start = time.perf_counter()
+    try:
+        yield s
+    except Exception as e:
+        s.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        s.seconds = time.perf_counter() - start
+        _current_span.reset(token)
+        render = _current_render.get()
+        if render is not None:
+            render.spans.append(s)
+        if TRACE_FILE:
+            _export({"type": "span", "ts": time.time(), "render": render.id if render else None,
+                     "page": render.page if render else None, **s.to_dict()})
+
+
+def traced(fn=None, *, name: str = None, kind: str = "compute"):
+    """Decorator: run every call of `fn` inside a span named after it."""
+    if fn is None:
+        return functools.partial(traced, name=name, kind=kind)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(name or fn.__name__, kind):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def note_cache(hit: bool):
+    """Count a cache hit / miss against the innermost open span (no-op outside one)."""
+    s = _current_span.get()
+    if s is not None:
+        if hit:
+            s.cache_hits += 1
+        else:
+            s.cache_misses += 1
+
+
+def note_bytes(n: int):
+    """Add received bytes to the innermost open span."""
+    s = _current_span.get()
+    if s is not None and n:
+        s.bytes += n
+
+
+def propagate(fn):
+    """Wrap `fn` to run in a copy of the caller's context, so spans on a worker thread join this render."""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+# -------------------------
+# Page renders
+# -------------------------
+
+def start_render(page: str) -> Render:
+    render = Render(page)
+    _current_render.set(render)
+    return render
+
+
+def debug_enabled() -> bool:
+    if DEBUG:
+        return True
+    import streamlit as st
+    try:
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+def finish_render():
+    """Export this render's per-stage summary and, in debug mode, show it in the sidebar."""
+    render = _current_render.get()
+    if render is None:
+        return
+    _current_render.set(None)
+    wall = time.perf_counter() - render.started
+    summary = render.summary()
+    _export({"type": "render", "ts": time.time(), "render": render.id, "page": render.page,
+             "seconds": wall, "stages": summary})
+
+    if debug_enabled():
+        import pandas as pd
+        import streamlit as st
+        with st.sidebar.expander(f"⏱️ Render timings — {wall * 1000:.0f} ms", expanded=False):
+            df = pd.DataFrame(summary, columns=["stage", "kind", "calls", "seconds", "bytes",
+                                                "cache_hits", "cache_misses"])
+            df["ms"] = (df.pop("seconds") * 1000).round(1)
+            df["KB"] = (df.pop("bytes") / 1024).round(1)
+            st.dataframe(df[["stage", "kind", "calls", "ms", "KB", "cache_hits", "cache_misses"]],
+                         hide_index=True, use_container_width=True)
+
+
+# -------------------------
+# Trace file report
+# -------------------------
+
+def stage_percentiles(path: str):
+    """p50 / p95 / max milliseconds per stage from a trace file."""
+    import pandas as pd
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    spans = pd.DataFrame([r for r in records if r.get("type") == "span"])
+    renders = pd.DataFrame([{"name": f"render:{r['page']}", "kind": "render", "seconds": r["seconds"], "bytes": 0,
+                             "cache_hits": 0, "cache_misses": 0} for r in records if r.get("type") == "render"])
+    df = pd.concat([spans, renders], ignore_index=True)
+    if df.empty:
+        return df
+    df["ms"] = df["seconds"] * 1000
+    grouped = df.groupby(["kind", "name"])
+    report = grouped["ms"].describe(percentiles=[0.5, 0.95])[["count", "50%", "95%", "max"]]
+    report = report.rename(columns={"50%": "p50_ms", "95%": "p95_ms", "max": "max_ms"})
+    report["KB"] = grouped["bytes"].sum() / 1024
+    report["cache_hits"] = grouped["cache_hits"].sum()
+    report["cache_misses"] = grouped["cache_misses"].sum()
+    return report.round(1).sort_values("p95_ms", ascending=False)
+
+
+if __name__ == "__main__":
+    trace_file = sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE
+    if not trace_file:
+        sys.exit("usage: python instrumentation.py <trace.jsonl>  (or set SWISH_TRACE_FILE)")
+    print(stage_percentiles(trace_file).to_string())
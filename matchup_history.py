@@ -0,0 +1,198 @@
+import os
+import tempfile
+import threading
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from disk_cache import CACHE_DIR
+from instrumentation import note_cache, traced
+from sleeper_client import sleeper_get_many
+
+# -------------------------
+# Season matchup history
+# -------------------------
+# Every week's Sleeper matchup rows for a league, one Parquet file per week:
+#
+#   .cache/history/<league_id>/week=<n>.parquet
+#
+# sync_history() fetches the weeks that have no file yet -- all of them
+# concurrently -- plus the current week, which changes while it is being played,
+# and the previous one, which can still pick up late scores and stat corrections
+# after Sleeper has moved on. A file is only rewritten when its contents changed,
+# so its mtime identifies that version of the week for anything derived from it.
+# MatchupHistory reads every week into one frame per league (memoized until a
+# file changes) and answers per-week and per-team queries from it.
+
+HISTORY_DIR = os.path.join(CACHE_DIR, "history")
+
+HISTORY_SCHEMA = pa.schema([
+    ("week", pa.int16()),
+    ("roster_id", pa.int32()),
+    ("matchup_id", pa.int32()),
+    ("points", pa.float64()),
+    ("starters", pa.list_(pa.string())),
+    ("players_points", pa.map_(pa.string(), pa.float64())),
+])
+
+
+def _league_dir(league_id: str) -> str:
+    return os.path.join(HISTORY_DIR, str(league_id))
+
+
+def _week_path(league_id: str, week: int) -> str:
+    return os.path.join(_league_dir(league_id), f"week={week}.parquet")
+
+
+def stored_weeks(league_id: str) -> list:
+    try:
+        names = os.listdir(_league_dir(league_id))
+    except OSError:
+        return []
+    return sorted(int(n[len("week="):-len(".parquet")]) for n in names
+                  if n.startswith("week=") and n.endswith(".parquet"))
+
+
+def matchups_to_table(week: int, matchups_week: list) -> pa.Table:
+    """Arrow table of one week's Sleeper matchup rows (HISTORY_SCHEMA)."""
+    rows = [m for m in matchups_week if m.get("roster_id") is not None]
+    return pa.table([
+        pa.array([week] * len(rows), pa.int16()),
+        pa.array([m["roster_id"] for m in rows], pa.int32()),
+        pa.array([m.get("matchup_id") for m in rows], pa.int32()),
+        pa.array([m.get("points") or 0.0 for m in rows], pa.float64()),
+        pa.array([[str(p) for p in m.get("starters") or []] for m in rows], pa.list_(pa.string())),
+        pa.array([list((m.get("players_points") or {}).items()) for m in rows],
+                 pa.map_(pa.string(), pa.float64())),
+    ], schema=HISTORY_SCHEMA)
+
+
+def write_week(league_id: str, week: int, matchups_week: list) -> bool:
+    """Write one week's file and atomically swap it in; False (untouched) if it is unchanged."""
+    path = _week_path(league_id, week)
+    table = matchups_to_table(week, matchups_week)
+    try:
+        if pq.read_table(path).equals(table):
+            return False
+    except (OSError, pa.ArrowInvalid):
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+@traced
+def sync_history(league_id: str, current_week: int) -> list:
+    """
+    Fetch the weeks 1..current_week that are not stored yet, plus the current
+    and previous week, concurrently. Returns the weeks written (new or changed);
+    a week that fails to fetch is left for the next sync.
+    """
+    have = set(stored_weeks(league_id))
+    weeks = [w for w in range(1, current_week + 1) if w not in have or w >= current_week - 1]
+    paths = {w: f"league/{league_id}/matchups/{w}" for w in weeks}
+    fetched = sleeper_get_many(paths.values())
+
+    written = []
+    for week, path in paths.items():
+        if fetched[path] is not None and write_week(league_id, week, fetched[path]):
+            written.append(week)
+    return written
+
+
+class MatchupHistory:
+    """Read-only view over one league's stored weeks."""
+
+    def __init__(self, league_id: str, files: dict):
+        self.league_id = league_id
+        self.files = files  # week -> mtime the frame was read at
+        tables = [pq.read_table(_week_path(league_id, w)) for w in sorted(files)]
+        self.table = pa.concat_tables(tables) if tables else HISTORY_SCHEMA.empty_table()
+
+    @property
+    def weeks(self) -> list:
+        return sorted(self.files)
+
+    @cached_property
+    def results(self) -> pd.DataFrame:
+        """
+        One row per team per week, sorted by (roster_id, week):
+        ['week', 'roster_id', 'matchup_id', 'points', 'opponent_id', 'opponent_points', 'result']
+        result is 'W' / 'L' / 'T', or None without an opponent.
+        """
+        df = self.table.select(["week", "roster_id", "matchup_id", "points"]).to_pandas()
+        games = df.dropna(subset=["matchup_id"])
+        opponents = games.merge(games, on=["week", "matchup_id"], suffixes=("", "_opp"))
+        opponents = opponents[opponents["roster_id"] != opponents["roster_id_opp"]]
+        df = df.merge(opponents[["week", "roster_id", "roster_id_opp", "points_opp"]]
+                      .rename(columns={"roster_id_opp": "opponent_id", "points_opp": "opponent_points"}),
+                      on=["week", "roster_id"], how="left")
+        diff = df["points"] - df["opponent_points"]
+        df["result"] = np.select([diff > 0, diff < 0, diff == 0], ["W", "L", "T"], default=None)
+        return df.sort_values(["roster_id", "week"]).reset_index(drop=True)
+
+    @cached_property
+    def _team_slices(self) -> dict:
+        roster_ids = self.results["roster_id"].to_numpy()
+        teams, starts = np.unique(roster_ids, return_index=True)
+        stops = np.r_[starts[1:], len(roster_ids)]
+        return {rid: slice(start, stop) for rid, start, stop in zip(teams.tolist(), starts, stops)}
+
+    def team(self, roster_id: int) -> pd.DataFrame:
+        """Every stored week of one team (a contiguous slice of `results`)."""
+        s = self._team_slices.get(roster_id)
+        return self.results.iloc[s] if s is not None else self.results.iloc[0:0]
+
+    def week(self, week: int) -> pd.DataFrame:
+        """Every team's row for one week (same columns as `results`)."""
+        results = self.results
+        return results[results["week"] == week]
+
+    def matchups(self, week: int) -> list:
+        """One week's rows in Sleeper's /matchups/{week} shape (None if the week is not stored)."""
+        if week not in self.files:
+            return None
+        rows = self.table.filter(pc.equal(self.table["week"], week)).to_pylist()
+        for r in rows:
+            r["players_points"] = dict(r["players_points"] or [])
+            del r["week"]
+        return rows
+
+    def weekly_points(self) -> pd.DataFrame:
+        """Points scored in games, weeks x roster_id (NaN for byes and weeks without an opponent)."""
+        games = self.results.dropna(subset=["opponent_id"])
+        return games.pivot(index="week", columns="roster_id", values="points")
+
+
+_lock = threading.Lock()
+_memo = {}  # league_id -> MatchupHistory
+
+
+@traced
+def get_history(league_id: str) -> MatchupHistory:
+    """The league's stored history, re-read only when a week file has changed."""
+    files = {}
+    for week in stored_weeks(league_id):
+        try:
+            files[week] = os.stat(_week_path(league_id, week)).st_mtime
+        except OSError:
+            pass
+    with _lock:
+        history = _memo.get(league_id)
+        note_cache(history is not None and history.files == files)
+        if history is None or history.files != files:
+            history = MatchupHistory(league_id, files)
+            _memo[league_id] = history
+    return history
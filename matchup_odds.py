@@ -0,0 +1,106 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import traced
+
+# -------------------------
+# Projected matchup odds
+# -------------------------
+# A starter's weekly score is treated as normal around its projection, with a
+# standard deviation proportional to it (a per-position coefficient of
+# variation). A team's total is the sum of its starters, so its mean and
+# variance are sums too, and a two-team matchup's win probability is
+# P(A - B > 0) = Phi((mean_A - mean_B) / sqrt(var_A + var_B)).
+#
+# Everything is computed for the whole week at once -- every matchup of every
+# league in one starters table -- with bincounts over team and matchup codes.
+
+POSITION_CV = {"QB": 0.35, "RB": 0.5, "WR": 0.55, "TE": 0.6, "K": 0.45, "DST": 0.6}
+DEFAULT_CV = 0.5
+
+# Abramowitz & Stegun 7.1.26 (absolute error < 1.5e-7): erf in plain array operations
+ERF_P = 0.3275911
+ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+
+def erf(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, float)
+    ax = np.abs(x)
+    t = 1 / (1 + ERF_P * ax)
+    poly = t * (ERF_A[0] + t * (ERF_A[1] + t * (ERF_A[2] + t * (ERF_A[3] + t * ERF_A[4]))))
+    return np.where(x == 0, 0.0, np.copysign(1 - poly * np.exp(-ax * ax), x))  # exactly 0.5 for even matchups
+
+
+def normal_cdf(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1 + erf(np.asarray(z, float) / math.sqrt(2)))
+
+
+@traced
+def get_win_probabilities(starters: pd.DataFrame) -> pd.DataFrame:
+    """
+    Projected total, standard deviation and win probability for every team in
+    `starters` (get_starters_df rows, optionally with a 'League ID' column).
+    Returns one row per team:
+    ['League ID', 'Matchup ID', 'Roster ID', 'Owner', 'Proj Total', 'Proj Std', 'Win Prob']
+    Win Prob is NaN for a matchup that is not exactly two teams.
+    """
+    columns = ["League ID", "Matchup ID", "Roster ID", "Owner", "Proj Total", "Proj Std", "Win Prob"]
+    if starters.empty:
+        return pd.DataFrame(columns=columns)
+    league = starters["League ID"] if "League ID" in starters else pd.Series("", index=starters.index)
+
+    proj = starters["Proj Points"].fillna(0).to_numpy(float)
+    position = starters["Position"] if "Position" in starters else pd.Series(index=starters.index, dtype=object)
+    cv = position.map(POSITION_CV).fillna(DEFAULT_CV).to_numpy(float)
+
+    # Starters -> teams
+    team_keys = pd.MultiIndex.from_arrays([league, starters["Matchup ID"], starters["Roster ID"]])
+    team_codes, teams = pd.factorize(team_keys)
+    n_teams = len(teams)
+    mean = np.bincount(team_codes, weights=proj, minlength=n_teams)
+    var = np.bincount(team_codes, weights=(cv * proj) ** 2, minlength=n_teams)
+    owners = starters["Owner"].to_numpy()[np.unique(team_codes, return_index=True)[1]]
+
+    # Teams -> matchups: a team's opponent totals are the matchup's totals minus its own
+    matchup_codes, _ = pd.factorize(pd.MultiIndex.from_arrays([teams.get_level_values(0),
+                                                               teams.get_level_values(1)]))
+    size = np.bincount(matchup_codes)[matchup_codes]
+    opp_mean = np.bincount(matchup_codes, weights=mean)[matchup_codes] - mean
+    opp_var = np.bincount(matchup_codes, weights=var)[matchup_codes] - var
+
+    diff, spread = mean - opp_mean, np.sqrt(var + opp_var)
+    # No spread (nobody projected): the higher total wins outright, equal totals are a coin flip
+    z = np.where(diff == 0, 0.0, np.copysign(np.inf, diff))
+    np.divide(diff, spread, out=z, where=spread > 0)
+    win_prob = np.where(size == 2, normal_cdf(z), np.nan)
+
+    return pd.DataFrame({
+        "League ID": teams.get_level_values(0),
+        "Matchup ID": teams.get_level_values(1),
+        "Roster ID": teams.get_level_values(2),
+        "Owner": owners,
+        "Proj Total": mean.round(1),
+        "Proj Std": np.sqrt(var).round(1),
+        "Win Prob": win_prob,
+    }, columns=columns)
+
+
+def add_matchup_odds(matchups: pd.DataFrame, team_odds: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add per-owner 'proj_totals' and 'win_probs' lists (aligned with 'roster_ids')
+    and 'closeness' (1 = coin flip, 0 = certain) to a get_matchups_with_owners table.
+    `team_odds` is get_win_probabilities output for this league.
+    """
+    if matchups.empty:
+        return matchups
+    matchups = matchups.copy()
+    by_roster = team_odds.set_index("Roster ID")
+    totals = by_roster["Proj Total"].to_dict()
+    probs = by_roster["Win Prob"].to_dict()
+    matchups["proj_totals"] = [[totals.get(rid, 0.0) for rid in rids] for rids in matchups["roster_ids"]]
+    matchups["win_probs"] = [[probs.get(rid, np.nan) for rid in rids] for rids in matchups["roster_ids"]]
+    favourite = np.array([max(p) if len(p) == 2 else np.nan for p in matchups["win_probs"]], float)
+    matchups["closeness"] = 1 - 2 * np.abs(favourite - 0.5)
+    return matchups
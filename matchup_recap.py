@@ -0,0 +1,144 @@
+import pandas as pd
+
+from disk_cache import DiskCache
+from instrumentation import traced
+from matchup_history import get_history
+from player_identity import attach_projections
+from utils import add_vorp_column, get_all_projections, get_player_info, get_player_map
+
+# -------------------------
+# Weekly matchup recap
+# -------------------------
+# Every matchup of a finished week in one pass: Sleeper's per-roster `starters`
+# and `players_points` are exploded into one long frame of (matchup, roster,
+# player, points), positions are joined from the player store index, and the
+# position-by-position totals, top scorers and margins all come from groupbys
+# over that frame. Finished weeks are cached per (league, week, mtime of the
+# stored week file): a week the history sync rewrites with corrected scores is
+# recapped again.
+
+RECAP_TTL = 30 * 24 * 60 * 60
+_recap_cache = DiskCache("matchup_recap", ttl=RECAP_TTL, max_bytes=32 * 1024 * 1024)
+
+
+def explode_starters(matchups_week: list) -> pd.DataFrame:
+    """
+    One row per starter of every matchup:
+    ['Matchup ID', 'Roster ID', 'player_id', 'Actual Points']
+    """
+    rows = pd.DataFrame([m for m in matchups_week if m.get("matchup_id")],
+                        columns=["matchup_id", "roster_id", "starters", "players_points"])
+    starters = (rows[["matchup_id", "roster_id", "starters"]]
+                .explode("starters").dropna(subset=["starters"])
+                .rename(columns={"starters": "player_id"}))
+
+    # players_points covers the whole roster (bench too); keep the starters' points
+    rows["players_points"] = rows["players_points"].map(lambda p: list((p or {}).items()))
+    points = rows[["roster_id", "players_points"]].explode("players_points").dropna(subset=["players_points"])
+    points = pd.DataFrame({
+        "roster_id": points["roster_id"].to_numpy(),
+        "player_id": [p for p, _ in points["players_points"]],
+        "Actual Points": [pts for _, pts in points["players_points"]],
+    })
+
+    df = starters.merge(points, on=["roster_id", "player_id"], how="left")
+    df["Actual Points"] = df["Actual Points"].fillna(0.0).astype(float)
+    return df.rename(columns={"matchup_id": "Matchup ID", "roster_id": "Roster ID"}).reset_index(drop=True)
+
+
+def build_recap(matchups_week: list, roster_to_owner: dict, player_info: pd.DataFrame,
+                player_map: dict, proj_df: pd.DataFrame) -> dict:
+    """
+    Recap tables for every matchup of one week:
+      starters   ['Matchup ID', 'Roster ID', 'Owner', 'Player', 'Position', 'VORP',
+                  'Actual Points', 'Top Scorer']
+      positions  ['Matchup ID', 'Position', 'Owner', 'Points', 'Winner']
+      matchups   ['Matchup ID', 'Owners', 'Points', 'Winner', 'Margin', 'Top Scorer', 'Top Points']
+    proj_df: projections with a VORP column (add_vorp_column).
+    """
+    df = explode_starters(matchups_week)
+    df["Owner"] = df["Roster ID"].map(lambda rid: roster_to_owner.get(rid, f"Team {rid}"))
+    df["Player"] = df["player_id"].map(player_map).fillna("Unknown Player")
+    df["Position"] = player_info["position"].astype(object).reindex(df["player_id"]).fillna("?").to_numpy()
+    df = attach_projections(df, proj_df, ["VORP"])
+    df["VORP"] = df["VORP"].fillna(0).round(1)
+
+    # Top scorer(s) of each team
+    team_max = df.groupby(["Matchup ID", "Roster ID"])["Actual Points"].transform("max")
+    df["Top Scorer"] = df["Actual Points"].eq(team_max) & df["Actual Points"].gt(0)
+    starters = df[["Matchup ID", "Roster ID", "Owner", "Player", "Position", "VORP",
+                   "Actual Points", "Top Scorer"]]
+
+    # Points by matchup, position and team, with the winner of each position battle
+    positions = (df.groupby(["Matchup ID", "Position", "Roster ID", "Owner"], as_index=False)["Actual Points"].sum()
+                   .rename(columns={"Actual Points": "Points"}))
+    teams = df[["Matchup ID", "Roster ID", "Owner"]].drop_duplicates()
+    positions = (teams.merge(positions[["Matchup ID", "Position"]].drop_duplicates(), on="Matchup ID")
+                      .merge(positions, on=["Matchup ID", "Position", "Roster ID", "Owner"], how="left")
+                      .fillna({"Points": 0.0}))
+    positions["Winner"] = _winners(positions, ["Matchup ID", "Position"], "Points")
+    positions = positions[["Matchup ID", "Position", "Owner", "Points", "Winner"]]
+
+    # Team totals, winners, margins and top scorers per matchup
+    totals = df.groupby(["Matchup ID", "Roster ID", "Owner"], as_index=False)["Actual Points"].sum()
+    totals["Winner"] = _winners(totals, ["Matchup ID"], "Actual Points")
+    top = df.sort_values("Actual Points", ascending=False).drop_duplicates("Matchup ID")
+    matchups = totals.groupby("Matchup ID").agg(
+        Owners=("Owner", list),
+        Points=("Actual Points", list),
+        Winner=("Winner", "first"),
+        High=("Actual Points", "max"),
+        Low=("Actual Points", "min"),
+    ).reset_index()
+    matchups["Margin"] = matchups.pop("High") - matchups.pop("Low")
+    matchups = matchups.merge(top[["Matchup ID", "Player", "Actual Points"]]
+                              .rename(columns={"Player": "Top Scorer", "Actual Points": "Top Points"}),
+                              on="Matchup ID", how="left")
+    return {"starters": starters, "positions": positions, "matchups": matchups}
+
+
+def _winners(df: pd.DataFrame, keys: list, points: str) -> pd.Series:
+    """Owner with the most `points` in each `keys` group ('Tie' when shared), broadcast to every row."""
+    grouped = df.groupby(keys)[points]
+    best = grouped.transform("max")
+    n_best = df[points].eq(best).groupby([df[k] for k in keys]).transform("sum")
+    leader = df["Owner"].where(df[points].eq(best)).groupby([df[k] for k in keys]).transform("first")
+    return leader.where(n_best == 1, "Tie")
+
+
+@traced
+def get_week_recap(snapshot, week: int, proj_df: pd.DataFrame = None) -> dict:
+    """
+    build_recap for `week` of a LeagueSnapshot (None if that week has no matchups),
+    read from the history store when the week is stored; finished, stored weeks
+    are cached per (league, week, file version).
+    proj_df: projections with the league's VORP (add_vorp_column); computed if omitted.
+    """
+    history = get_history(snapshot.league_id)
+
+    def compute():
+        matchups_week = history.matchups(week) or snapshot.matchups(week)
+        if not matchups_week:  # not fetched (or no games): nothing worth caching
+            return None
+        vorp_df = proj_df if proj_df is not None else add_vorp_column(get_all_projections(), snapshot.league)
+        return build_recap(matchups_week, snapshot.roster_to_owner, get_player_info(), get_player_map(), vorp_df)
+
+    if week >= snapshot.current_week or week not in history.files:  # still being played / not stored
+        return compute()
+    return _recap_cache.get_or_set((snapshot.league_id, week, history.files[week]), compute)
+
+
+def cache_week_recaps(snapshot, proj_df: pd.DataFrame = None) -> list:
+    """Recap every finished, stored week of a LeagueSnapshot; only new or rewritten weeks are computed."""
+    weeks = [w for w in get_history(snapshot.league_id).weeks if w < snapshot.current_week]
+    for week in weeks:
+        get_week_recap(snapshot, week, proj_df)
+    return weeks
+
+
+def load_week_recap(league_id: str, week: int) -> dict:
+    """The cached recap of a finished, stored week (None until cache_week_recaps has built it)."""
+    files = get_history(league_id).files
+    if week not in files:
+        return None
+    return _recap_cache.get((league_id, week, files[week]))
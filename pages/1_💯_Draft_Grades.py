@@ -4,9 +4,12 @@ import sys, os
 
 # Add parent folder to path for utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import get_league_data, get_draft, get_all_projections, calculate_dynamic_vorp, assign_grades, split_player_team, get_league_names
+from utils import assign_grades
+from refresher import get_snapshot_league_names, page_snapshot
+from instrumentation import finish_render, start_render
 
 st.title("💯 Draft Grades")
+start_render("Draft Grades")
 
 # League IDs
 league_ids = {
@@ -16,7 +19,7 @@ league_ids = {
     "1264094054845513728": None,
 }
 
-league_ids = get_league_names(league_ids)
+league_ids = get_snapshot_league_names(league_ids)
 
 st.write("### Available Leagues")
 for lid, name in league_ids.items():
@@ -29,49 +32,25 @@ league_id = st.sidebar.selectbox(
 )
 selected_league_name = league_ids[league_id]
 
-# Fetch draft + league info
-league, scoring, roster_to_owner = get_league_data(league_id)
-draft_id, picks, draft_time = get_draft(league_id)
+# Draft picks, scored by the refresher (VORP per pick, matched by Sleeper player_id)
+snapshot = page_snapshot(league_id)
+picks_df, draft_time = snapshot["draft_picks"], snapshot["meta"]["draft_time"]
+roster_to_owner = picks_df.drop_duplicates("roster_id").set_index("roster_id")["Owner"].to_dict()
 
-if not picks:
+if picks_df.empty:
     if not draft_time:
         st.error("No draft time set for this league.")
+        finish_render()
         st.stop()
     st.error(f"No draft picks found yet. Draft is scheduled for {draft_time}.")
+    finish_render()
     st.stop()
 
-# Projections
-proj_df = get_all_projections()
-if proj_df.empty:
-    st.error("Failed to fetch projections from FantasyPros.")
-    st.stop()
-
-# Flatten multi-level headers if present
-if isinstance(proj_df.columns, pd.MultiIndex):
-    proj_df.columns = ['_'.join(filter(None, col)).strip() for col in proj_df.columns.values]
-
-proj_df = proj_df.rename(columns={'MISC_FPTS': 'FPTS','Unnamed: 0_level_0_Player':'Player'})
-proj_df = split_player_team(proj_df)
-
-proj_df = proj_df[['Player', 'FPTS', 'Position']]
-proj_df = proj_df.dropna(subset=['FPTS']).copy()
-proj_df['FPTS'] = proj_df['FPTS'].astype(float)
-
-vorp = calculate_dynamic_vorp(proj_df)
-
 # Tally team draft scores
-team_scores = {}
-team_picks = {}
-
-for pick in picks:
-    player_name = pick.get("metadata", {}).get("first_name", "") + " " + pick.get("metadata", {}).get("last_name", "")
-    roster_id = pick["roster_id"]
-    value = vorp.get(player_name, 0)
-    if roster_id not in team_scores:
-        team_scores[roster_id] = 0
-        team_picks[roster_id] = []
-    team_scores[roster_id] += value
-    team_picks[roster_id].append((player_name, value))
+by_team = picks_df.groupby("roster_id", sort=False)["Value"]
+team_scores = by_team.sum().to_dict()
+best_picks = picks_df.loc[by_team.idxmax()].set_index("roster_id")
+worst_picks = picks_df.loc[by_team.idxmin()].set_index("roster_id")
 
 grades = assign_grades(team_scores)
 
@@ -79,8 +58,8 @@ grades = assign_grades(team_scores)
 results = []
 for roster_id, (score, grade) in grades.items():
     owner_name = roster_to_owner.get(roster_id, f"Team {roster_id}")
-    best_pick = max(team_picks[roster_id], key=lambda x: x[1], default=(None, 0))
-    worst_pick = min(team_picks[roster_id], key=lambda x: x[1], default=(None, 0))
+    best_pick = tuple(best_picks.loc[roster_id, ["Player", "Value"]])
+    worst_pick = tuple(worst_picks.loc[roster_id, ["Player", "Value"]])
     results.append({
         "Owner": owner_name,
         "Score": round(score, 1),
@@ -95,3 +74,5 @@ df.index = df.index + 1  # Rank starting at 1
 
 st.subheader(f"Draft Grades — {selected_league_name}")
 st.dataframe(df, use_container_width=True)
+
+finish_render()
@@ -1,13 +1,15 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import sys, os
 
 # Add parent folder to path for utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import get_league_data, get_standings, get_draft_grades, get_league_names, calculate_power_scores
+from refresher import get_snapshot_league_names, page_snapshot
+from instrumentation import finish_render, span, start_render
 
 st.title("🏆 Power Rankings")
+start_render("Power Rankings")
 
 # League IDs
 league_ids = {
@@ -17,8 +19,8 @@ league_ids = {
     "1264094054845513728": None,
 }
 
-# Fetch league names using utils
-league_ids = get_league_names(league_ids)
+# League names (from the latest snapshots)
+league_ids = get_snapshot_league_names(league_ids)
 
 league_id = st.sidebar.selectbox(
     "Select League",
@@ -27,34 +29,51 @@ league_id = st.sidebar.selectbox(
 )
 selected_league_name = league_ids[league_id]
 
-# --- Fetch standings and draft grades ---
-standings_df = get_standings(league_id)
-draft_grades_df = get_draft_grades(league_id)
+# --- Standings, draft grades and power scores from the latest snapshot ---
+snapshot = page_snapshot(league_id)
+standings_df = snapshot["standings"]
+draft_grades_df = snapshot["draft_grades"]
 
 if standings_df.empty or draft_grades_df.empty:
     st.info("Not enough data to generate power rankings.")
+    finish_render()
     st.stop()
 
-# Merge standings and draft grades
-merged = pd.merge(standings_df, draft_grades_df, left_on="Owner", right_on="Owner", how="left")
-merged["Draft Score"] = merged["Draft Score"].fillna(0)
-
-# --- Compute Power Score ---
-# Weight record vs draft grade based on season progress
-league, _, _ = get_league_data(league_id)
-merged = calculate_power_scores(standings_df, draft_grades_df, league)
+# Power Score weights record vs draft grade based on season progress
+merged = snapshot["power_scores"]
 
 # --- Display table ---
 st.subheader(f"Power Rankings — {selected_league_name}")
 st.dataframe(merged[["Owner", "Wins", "Losses", "PF", "Draft Score", "Power Score"]], use_container_width=True)
 
-# --- Optional trend chart ---
+# --- Playoff odds (100k simulated seasons over the remaining schedule) ---
+odds_df = snapshot["playoff_odds"]
+if not odds_df.empty:
+    st.subheader("Playoff Odds")
+    st.caption("From 100,000 simulated seasons: each team's remaining games are played out "
+               "using its scoring so far; seeds go by wins, then points for.")
+    odds_df = odds_df.set_index("Owner")
+    st.dataframe(odds_df.style.format("{:.1f}"), use_container_width=True)
+
+# --- Trend chart: Power Score after every completed week ---
 st.subheader("Power Score Trend")
-fig, ax = plt.subplots(figsize=(10, 6))
-for _, row in merged.iterrows():
-    ax.barh(row["Owner"], row["Power Score"])
-
-ax.set_xlabel("Power Score")
-ax.set_ylabel("Team")
-ax.invert_yaxis()
-st.pyplot(fig)
+history_df = snapshot["power_history"]
+if history_df.empty:
+    st.info("The trend appears once the first week is complete.")
+else:
+    trend = history_df.pivot(index="week", columns="Owner", values="Power Score")
+    trend = trend[merged["Owner"][merged["Owner"].isin(trend.columns)]]  # legend in current ranking order
+    with span("matplotlib", kind="chart"):
+        # Figure, not pyplot: never registered globally, so nothing is left behind per render
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        for owner in trend.columns:
+            ax.plot(trend.index, trend[owner], marker="o", label=owner)
+
+        ax.set_xlabel("Week")
+        ax.set_ylabel("Power Score")
+        ax.set_xticks(trend.index)
+        ax.legend(loc="center left", bbox_to_anchor=(1, 0.5), fontsize="small")
+        st.pyplot(fig)
+
+finish_render()
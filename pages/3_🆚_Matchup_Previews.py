@@ -1,17 +1,15 @@
 import streamlit as st
 import pandas as pd
-import requests
 import os
 import sys
 
 # Add parent folder to path for utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import (
-    get_league_data, get_league_names, get_standings, get_draft_grades, get_matchups_with_owners,
-    get_all_projections, fetch_weekly_projections, split_player_team, get_player_map, calculate_power_scores
-)
+from refresher import get_snapshot_league_names, page_snapshot
+from instrumentation import finish_render, start_render
 
 st.title("🆚 Matchup Previews")
+start_render("Matchup Previews")
 
 # ------------------------
 # League selection
@@ -22,7 +20,7 @@ league_ids = {
     "1264093787064377344": None,
     "1264094054845513728": None,
 }
-league_ids = get_league_names(league_ids)
+league_ids = get_snapshot_league_names(league_ids)
 
 league_id = st.sidebar.selectbox(
     "Select League",
@@ -32,50 +30,26 @@ league_id = st.sidebar.selectbox(
 selected_league_name = league_ids[league_id]
 
 # ------------------------
-# Fetch power rankings
+# Power rankings + matchups from the latest snapshot
 # ------------------------
-standings_df = get_standings(league_id)
-draft_grades_df = get_draft_grades(league_id)
-if standings_df.empty or draft_grades_df.empty:
+snapshot = page_snapshot(league_id)
+if snapshot["standings"].empty or snapshot["draft_grades"].empty:
     st.info("Not enough data to generate matchup previews.")
+    finish_render()
     st.stop()
 
-# ------------------------
-# Fetch matchups
-# ------------------------
-league, _, roster_to_owner = get_league_data(league_id)
-current_week = league.get("settings", {}).get("leg", 1)
-merged = calculate_power_scores(standings_df, draft_grades_df, league)
-
-try:
-    resp = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/matchups/{current_week}")
-    resp.raise_for_status()
-    matchups = pd.DataFrame(resp.json())
-except:
-    st.error("Failed to fetch matchups from Sleeper API.")
-    st.stop()
-
+current_week = snapshot["meta"]["week"]
+matchups = snapshot["matchups"]
 if matchups.empty:
     st.info(f"No matchups found for week {current_week}")
+    finish_render()
     st.stop()
 
-# ------------------------
-# Load or fetch player ID → name mapping
-# ------------------------
-player_map = get_player_map("player_ids.csv")
-
-# --- Fetch matchups for the current week ---
-matchups_week = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/matchups/{current_week}").json()
-
-# Directly create DataFrame assuming each row has 'roster_id' and 'matchup_id'
-rosters_df = pd.DataFrame([{
-    "roster_id": m.get("roster_id"),
-    "matchup_id": m.get("matchup_id")
-} for m in matchups_week])
-
-matchups = get_matchups_with_owners(rosters_df, roster_to_owner, merged)
-
-default_idx = matchups["avg_power"].idxmax()
+# Matchup of the Week: the closest projected game (older snapshots: highest average power)
+if "closeness" in matchups and matchups["closeness"].notna().any():
+    default_idx = matchups["closeness"].idxmax()
+else:
+    default_idx = matchups["avg_power"].idxmax()
 
 # Dropdown
 selected_matchup_idx = st.selectbox(
@@ -94,59 +68,19 @@ matchup_row = matchups.loc[selected_matchup_idx]
 is_matchup_of_week = selected_matchup_idx == default_idx
 st.subheader("🔥 Matchup of the Week!" if is_matchup_of_week else "Selected Matchup")
 
-weekly_proj_map = fetch_weekly_projections(current_week)
-
-roster_ids = matchup_row["roster_ids"]
 owners = matchup_row["owners"]
 matchup_id = matchup_row["matchup_id"]
 
-def get_starters_df(matchups_week, selected_matchup_id, roster_to_owner, weekly_proj_map, player_map):
-    """
-    Returns a DataFrame of starters for a given matchup, with projected weekly points.
-    
-    matchups_week: list of matchup dicts from Sleeper API
-    selected_matchup_id: the matchup_id we want
-    roster_to_owner: dict mapping roster_id -> owner name
-    weekly_proj_map: dict mapping player_name -> projected points
-    player_map: dict mapping player_id -> player_name
-    """
-    
-    rows = []
-    
-    # Filter only the rows for the selected matchup
-    matchup_rows = [m for m in matchups_week if m["matchup_id"] == selected_matchup_id]
-    
-    for m in matchup_rows:
-        roster_id = m["roster_id"]
-        owner = roster_to_owner.get(roster_id, f"Team {roster_id}")
-        starters = m.get("starters", [])
-        
-        for player_id in starters:
-            player_name = player_map.get(player_id, "Unknown Player")
-            proj_points = weekly_proj_map.get(player_name, 0)
-            rows.append({
-                "Matchup ID": selected_matchup_id,
-                "Roster ID": roster_id,
-                "Owner": owner,
-                "Player": player_name,
-                "Proj Points": round(proj_points, 1)
-            })
-    
-    df = pd.DataFrame(rows)
-    
-    # Calculate total projected points per owner
-    totals = df.groupby("Owner")["Proj Points"].sum().reset_index()
-    totals = totals.rename(columns={"Proj Points": "Total Proj Points"})
-    
-    # Merge total back into the starters df if desired
-    df = df.merge(totals, on="Owner", how="left")
-    
-    return df
-
-
-starters_df = get_starters_df(matchups_week, matchup_id, roster_to_owner, weekly_proj_map, player_map)
+# Starters with projected weekly points, for every matchup of the week
+starters_df = snapshot["starters"]
+starters_df = starters_df[starters_df["Matchup ID"] == matchup_id]
 
+win_probs = dict(zip(owners, matchup_row["win_probs"])) if "win_probs" in matchup_row else {}
 for owner in owners:
     total_points = starters_df[starters_df["Owner"] == owner]["Total Proj Points"].iloc[0]
-    st.markdown(f"### {owner} Starters — Total Projected Points: {round(total_points,1)}")
+    win_prob = win_probs.get(owner)
+    win_text = f" — Win Probability: {win_prob:.0%}" if win_prob is not None and pd.notna(win_prob) else ""
+    st.markdown(f"### {owner} Starters — Total Projected Points: {round(total_points,1)}{win_text}")
     st.table(starters_df[starters_df["Owner"] == owner][["Player", "Proj Points"]])
+
+finish_render()
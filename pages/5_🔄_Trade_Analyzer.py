@@ -1,14 +1,19 @@
 import streamlit as st
-import requests
 import pandas as pd
-import matplotlib.pyplot as plt
 import sys, os
 
 # Add parent folder to path for utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import get_league_names, get_league_data, get_player_map
+from trade_charts import TRADES_PER_FIGURE, chart_pages, get_trade_chart
+from trade_engine import SIDE_COLUMNS, evaluate_trades
+from trade_values import get_trade_values
+from transaction_history import get_transactions
+from utils import get_player_info, get_player_map
+from refresher import get_snapshot_league_names, page_snapshot
+from instrumentation import finish_render, start_render
 
 st.title("🔄 Trade Analyzer")
+start_render("Trade Analyzer")
 
 # ------------------------
 # League selection
@@ -19,7 +24,7 @@ league_ids = {
     "1264093787064377344": None,
     "1264094054845513728": None,
 }
-league_ids = get_league_names(league_ids)
+league_ids = get_snapshot_league_names(league_ids)
 
 league_id = st.sidebar.selectbox(
     "Select League",
@@ -29,42 +34,40 @@ league_id = st.sidebar.selectbox(
 selected_league_name = league_ids[league_id]
 
 # ------------------------
-# Load player map CSV
+# Player names from the shared player store (built by the refresher; never downloaded in a render)
 # ------------------------
-player_map = get_player_map("player_ids.csv")
+player_map = get_player_map(block=False)
+if not player_map:
+    st.info("Player names are still being prepared: players show as Sleeper IDs for now.")
 
 # ------------------------
-# Fetch trades from Sleeper API
+# Owners and positional need (each roster just before each trade) from the latest
+# snapshot; trades from the local transaction store (both kept up to date by the refresher)
 # ------------------------
-def fetch_trades(league_id):
-    url = f"https://api.sleeper.app/v1/league/{league_id}/transactions"
-    resp = requests.get(url)
-    if resp.ok:
-        trades = [t for t in resp.json() if t.get("type") == "trade"]
-        return trades
-    return []
-
-trades = fetch_trades(league_id)
-if not trades:
+snapshot = page_snapshot(league_id)
+owners = snapshot["owners"]
+roster_to_owner = dict(zip(owners["roster_id"], owners["Owner"])) if not owners.empty else {}
+need = snapshot["positional_need"]
+if need.empty:  # snapshots written before positional need was stored
+    need = pd.DataFrame(columns=["roster_id", "position", "need"])
+transactions = get_transactions(league_id)
+
+trades = transactions.trades()
+if trades.empty:
     st.info("No trades found for this league.")
+    finish_render()
     st.stop()
 
 # ------------------------
-# Fetch FantasyCalc player values (re-draft)
+# FantasyCalc player values for this league's format, by Sleeper player_id
 # ------------------------
-def fetch_trade_values():
-    url = "https://api.fantasycalc.com/values/current?isDynasty=false&numQbs=1&numTeams=12&ppr=1"
-    resp = requests.get(url)
-    if resp.ok:
-        return {p['player']: p['value'] for p in resp.json()}
-    return {}
-
-trade_values = fetch_trade_values()
-if not trade_values:
-    st.warning("Failed to fetch FantasyCalc values, grades may be inaccurate.")
+# Read from the cache whatever its age; the refresher refetches stale values
+trade_values = get_trade_values(params=snapshot["meta"].get("value_params"), fetch=False)
+if trade_values.empty:
+    st.warning("FantasyCalc values are not available yet, grades may be inaccurate.")
 
 # ------------------------
-# Grade trades A-F
+# Grade trades A-F on the need-adjusted edge (% of the value that changed hands)
 # ------------------------
 def grade_trade(value_diff):
     if value_diff > 20:
@@ -79,45 +82,56 @@ def grade_trade(value_diff):
         return "F"
 
 # ------------------------
-# Evaluate trades and replace player IDs with names
+# Evaluate every trade at once (values adjusted for each roster's positional need)
 # ------------------------
+player_positions = get_player_info(block=False)["position"]
+moves = transactions.moves
+moves = moves[(moves["type"] == "trade") & (moves["status"] == "complete")].assign(**{"League ID": league_id})
+sides = evaluate_trades(
+    moves,
+    trade_values.reset_index().assign(**{"League ID": league_id}),
+    need.assign(**{"League ID": league_id}),
+    player_positions,
+).set_index(["transaction_id", "roster_id"])
+
+# Every side of every trade, including sides that only moved draft picks or FAAB
+# (no player moves, so no row from evaluate_trades): zero value, no players
+sides = sides.reindex(pd.MultiIndex.from_tuples(
+    [(tid, rid) for tid, roster_ids in zip(trades["transaction_id"], trades["roster_ids"]) for rid in roster_ids],
+    names=["transaction_id", "roster_id"]))
+for col in ("Players In", "Players Out"):
+    sides[col] = [p if isinstance(p, list) else [] for p in sides[col]]
+value_cols = [c for c in SIDE_COLUMNS if c.startswith(("Value", "Adj Value")) or c == "Edge %"]
+sides[value_cols] = sides[value_cols].astype(float).fillna(0)
+
+# One row per side: every roster of a multi-team trade is shown and graded
 trade_data = []
-
-for trade in trades:
-    adds = trade.get("adds", {})
-    drops = trade.get("drops", {})
-
-    # Flatten player IDs for each side
-    team1_players = [player_map.get(pid, str(pid)) for sublist in adds.values() for pid in sublist]
-    team2_players = [player_map.get(pid, str(pid)) for sublist in drops.values() for pid in sublist]
-
-    # Sum FantasyCalc values
-    t1_value = sum([trade_values.get(name, 0) for name in team1_players])
-    t2_value = sum([trade_values.get(name, 0) for name in team2_players])
-
-    grade = grade_trade(t1_value - t2_value)
-
-    trade_data.append({
-        "Team 1 Players": ", ".join(team1_players),
-        "Team 2 Players": ", ".join(team2_players),
-        "Team 1 Value": t1_value,
-        "Team 2 Value": t2_value,
-        "Grade": grade
-    })
+for trade_no, (transaction_id, roster_ids) in enumerate(zip(trades["transaction_id"], trades["roster_ids"]), 1):
+    for rid in roster_ids:
+        side = sides.loc[(transaction_id, rid)]
+        trade_data.append({
+            "Trade": trade_no,
+            "Team": roster_to_owner.get(rid, f"Team {rid}"),
+            "Players In": ", ".join(player_map.get(pid, pid) for pid in side["Players In"]),
+            "Players Out": ", ".join(player_map.get(pid, pid) for pid in side["Players Out"]),
+            "Value In": side["Value In"],
+            "Value Out": side["Value Out"],
+            "Need-Adjusted Edge %": side["Edge %"],
+            "Grade": grade_trade(side["Edge %"]),
+        })
 
 df = pd.DataFrame(trade_data)
 st.subheader("Trades and Grades")
 st.dataframe(df, use_container_width=True)
 
 # ------------------------
-# Plot stacked bar chart for each trade
+# Trade value chart: every trade in one figure per page, cached per (league, trades)
 # ------------------------
 st.subheader("Trade Value Comparison")
-for i, row in df.iterrows():
-    fig, ax = plt.subplots(figsize=(6,2))
-    ax.barh([f"Team 1: {row['Team 1 Players']}"], row["Team 1 Value"], color='skyblue', label="Team 1")
-    ax.barh([f"Team 2: {row['Team 2 Players']}"], row["Team 2 Value"], color='salmon', label="Team 2")
-    ax.set_xlabel("Fantasy Value")
-    ax.set_title(f"Trade {i+1} - Grade: {row['Grade']}")
-    ax.legend()
-    st.pyplot(fig)
+n_trades = len(trades)
+n_pages = chart_pages(n_trades)
+page = st.selectbox("Chart page", range(n_pages), format_func=lambda p: f"Trades {p * TRADES_PER_FIGURE + 1}–"
+                    f"{min((p + 1) * TRADES_PER_FIGURE, n_trades)}") if n_pages > 1 else 0
+st.image(get_trade_chart(league_id, df, page), use_container_width=True)
+
+finish_render()
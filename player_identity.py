@@ -0,0 +1,117 @@
+import hashlib
+import threading
+
+import pandas as pd
+
+from disk_cache import DiskCache
+from instrumentation import note_cache, traced
+from player_store import get_player_store
+
+# -------------------------
+# Sleeper player_id <-> FantasyPros projection identity
+# -------------------------
+# Sleeper names ("Marvin Harrison Jr.", "D.J. Moore", "Gabe Davis") and FantasyPros
+# names ("Marvin Harrison", "DJ Moore", "Gabriel Davis") rarely agree exactly, and
+# a missed string match silently scores 0. Both sides are reduced to a normalized
+# "name|POSITION" key; the player_id -> key index is built once per projection
+# refresh (or player store refresh) and persisted.
+
+# Sleeper roster slot / position -> FantasyPros position label
+SLEEPER_TO_FP_POSITION = {'DEF': 'DST'}
+
+# First names folded onto one spelling, applied to both sides
+NICKNAMES = {
+    'gabriel': 'gabe', 'mitchell': 'mitch', 'joshua': 'josh', 'kenneth': 'ken', 'christopher': 'chris',
+    'nathaniel': 'nate', 'jeffery': 'jeff', 'jeffrey': 'jeff', 'matthew': 'matt', 'michael': 'mike',
+    'robert': 'rob', 'daniel': 'dan', 'benjamin': 'ben', 'zachary': 'zach', 'cameron': 'cam',
+    'samuel': 'sam', 'nicholas': 'nick', 'jonathan': 'jon', 'william': 'will', 'joseph': 'joe',
+    'anthony': 'tony', 'hollywood': 'marquise', 'chigoziem': 'chig', 'scotty': 'scott',
+}
+
+_identity_cache = DiskCache("identity_index", ttl=7 * 24 * 60 * 60, max_bytes=16 * 1024 * 1024)
+_lock = threading.Lock()
+_memo = {}  # fingerprint -> player_id -> proj_key Series
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Lower-case, ASCII-fold, drop punctuation and suffixes, fold nicknames."""
+    s = names.fillna("").astype(str)
+    s = s.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    s = s.str.lower().str.replace(r"[.'`,]", "", regex=True).str.replace(r"[-_]", " ", regex=True)
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
+    s = s.str.replace(r" (?:jr|sr|ii|iii|iv|v)$", "", regex=True)
+    return s.str.replace(r"^\S+", lambda m: NICKNAMES.get(m.group(0), m.group(0)), regex=True)
+
+
+def projection_keys(df: pd.DataFrame, name_col: str = 'Player', position_col: str = 'Position') -> pd.Series:
+    """Normalized "name|POSITION" key for each row."""
+    positions = df[position_col].astype(object).fillna("").astype(str).str.upper().replace(SLEEPER_TO_FP_POSITION)
+    return normalize_names(df[name_col]) + "|" + positions
+
+
+def build_identity_index(players: pd.DataFrame, proj_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    players: player store frame indexed by player_id (name, position, team, status)
+    proj_df: projections with ['Player', 'Team', 'Position']
+    Returns ['player_id', 'proj_key'] for every Sleeper player with a projection.
+    """
+    players = players.reset_index()[['player_id', 'name', 'position', 'team', 'status']]
+    players = players[players['position'].notna()].copy()
+    players['proj_key'] = projection_keys(players, 'name', 'position')
+
+    proj = pd.DataFrame({'proj_key': projection_keys(proj_df), 'proj_team': proj_df['Team'].astype(object)})
+    matched = players.merge(proj.drop_duplicates('proj_key'), on='proj_key', how='inner')
+
+    # Namesakes (often retired players) share a key: keep whoever is on the
+    # projection's team, else the best candidate (active first)
+    matched['team_match'] = matched['team'].astype(object).eq(matched['proj_team']).astype(int)
+    matched['active'] = matched['status'].astype(object).eq('Active').astype(int)
+    best = (matched.sort_values(['proj_key', 'team_match', 'active'], ascending=[True, False, False])
+                   .drop_duplicates('proj_key'))
+    keep = matched['team_match'].eq(1) | matched['player_id'].isin(best['player_id'])
+    return matched.loc[keep, ['player_id', 'proj_key']].reset_index(drop=True)
+
+
+def _fingerprint(store, proj_df: pd.DataFrame) -> str:
+    digest = hashlib.sha1(repr(store.mtime).encode())
+    cols = proj_df[['Player', 'Team', 'Position']].astype(object)
+    digest.update(pd.util.hash_pandas_object(cols, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@traced
+def get_identity_index(proj_df: pd.DataFrame) -> pd.Series:
+    """
+    Sleeper player_id -> projection key for this projection frame. Built once per
+    (projections, player store) version, persisted on disk and memoized in-process.
+    """
+    store = get_player_store()
+    fingerprint = _fingerprint(store, proj_df)
+    with _lock:
+        if fingerprint in _memo:
+            note_cache(True)
+            return _memo[fingerprint]
+
+    index = _identity_cache.get(fingerprint)
+    if index is None:
+        index = build_identity_index(store.df, proj_df)
+        _identity_cache.set(fingerprint, index)
+    series = index.set_index('player_id')['proj_key']
+
+    with _lock:
+        if len(_memo) >= 8:
+            _memo.pop(next(iter(_memo)))
+        _memo[fingerprint] = series
+    return series
+
+
+@traced
+def attach_projections(df: pd.DataFrame, proj_df: pd.DataFrame, columns, id_col: str = 'player_id') -> pd.DataFrame:
+    """
+    Merge projection `columns` onto rows keyed by Sleeper player id, through the
+    identity index (NaN where a player has no projection).
+    """
+    keys = get_identity_index(proj_df).rename('proj_key')
+    proj = proj_df.assign(proj_key=projection_keys(proj_df)).drop_duplicates('proj_key')
+    return (df.merge(keys, left_on=id_col, right_index=True, how='left')
+              .merge(proj[['proj_key'] + list(columns)], on='proj_key', how='left'))
@@ -0,0 +1,224 @@
+import codecs
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from functools import cached_property
+
+import pandas as pd
+import pyarrow as pa
+
+from disk_cache import CACHE_DIR
+from instrumentation import traced
+from sleeper_client import sleeper_stream
+
+# -------------------------
+# Sleeper player metadata store
+# -------------------------
+# /players/nfl is a ~10k entry payload that changes at most daily. It is kept
+# as an uncompressed Arrow IPC file and memory-mapped, so every Streamlit session
+# in the process shares one read-only copy. A background thread re-downloads it
+# on a schedule and swaps the new file in with os.replace. The download is
+# decoded one player at a time, so a refresh never holds the whole payload.
+
+PLAYER_STORE_PATH = os.path.join(CACHE_DIR, "players.arrow")
+PLAYER_REFRESH_INTERVAL = float(os.environ.get("SWISH_PLAYER_REFRESH_INTERVAL", 24 * 60 * 60))
+
+PLAYER_SCHEMA = pa.schema([
+    ("player_id", pa.string()),
+    ("name", pa.string()),
+    ("position", pa.dictionary(pa.int16(), pa.string())),
+    ("team", pa.dictionary(pa.int16(), pa.string())),
+    ("status", pa.dictionary(pa.int16(), pa.string())),
+])
+
+
+class PlayerStore:
+    """Read-only view over one version of the memory-mapped player file."""
+
+    def __init__(self, path: str = PLAYER_STORE_PATH):
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+        # Zero-copy: the table's buffers point straight into the mapped file
+        self._source = pa.memory_map(path, "r")
+        self.table = pa.ipc.open_file(self._source).read_all()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @cached_property
+    def names(self) -> dict:
+        """player_id -> player name"""
+        return dict(zip(self.table.column("player_id").to_pylist(), self.table.column("name").to_pylist()))
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        """DataFrame indexed by player_id with name, position, team, status."""
+        return self.table.to_pandas().set_index("player_id")
+
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def iter_object_items(chunks, encoding="utf-8"):
+    """
+    Yield (key, value) for each member of a top-level JSON object read from an
+    iterable of byte chunks, decoding one member at a time. Only the current
+    member (plus one partial chunk) is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+
+    def more():
+        # Drop what has been consumed and append the next chunk
+        nonlocal buf, pos, eof
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buf, pos = buf[pos:] + text.decode(chunk or b"", final=eof), 0
+
+    def punctuation():
+        # Next non-whitespace character (consumed), or "" at end of stream
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                break
+            more()
+        char = buf[pos:pos + 1]
+        pos += len(char)
+        return char
+
+    if punctuation() != "{":
+        raise ValueError("Expected a JSON object")
+    if punctuation() == "}":
+        return
+    pos -= 1
+
+    while True:
+        while True:
+            try:
+                key, end = decoder.raw_decode(buf, pos)
+                end = _WHITESPACE.match(buf, end).end()
+                if buf[end:end + 1] != ":":
+                    raise ValueError("Expected ':'")
+                value, end = decoder.raw_decode(buf, _WHITESPACE.match(buf, end + 1).end())
+                # Only trust the value once its delimiter is in the buffer -- a number
+                # at the end of a chunk ("-1." of "-1.5") may be cut off
+                delimiter = _WHITESPACE.match(buf, end).end()
+                if buf[delimiter:delimiter + 1] in (",", "}") or eof:
+                    break
+            except ValueError:
+                if eof:
+                    raise
+            more()
+        pos = end
+        yield key, value
+
+        char = punctuation()
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError(f"Expected ',' or '}}' in JSON object, got {char!r}")
+        punctuation()
+        pos -= 1
+
+
+def players_to_table(players) -> pa.Table:
+    """
+    Build the store's Arrow table from the /players/nfl payload: a dict
+    {player_id: {...}} or an iterable of (player_id, {...}) pairs.
+    """
+    items = players.items() if isinstance(players, dict) else players
+    ids, names, positions, teams, statuses = [], [], [], [], []
+    for player_id, p in items:
+        ids.append(player_id)
+        name = p.get("full_name") or " ".join(filter(None, [p.get("first_name"), p.get("last_name")]))
+        names.append(name or None)
+        positions.append(p.get("position"))
+        teams.append(p.get("team"))
+        statuses.append(p.get("status"))
+    return pa.table([
+        pa.array(ids, pa.string()),
+        pa.array(names, pa.string()),
+        pa.array(positions, pa.string()).dictionary_encode(),
+        pa.array(teams, pa.string()).dictionary_encode(),
+        pa.array(statuses, pa.string()).dictionary_encode(),
+    ], schema=PLAYER_SCHEMA)
+
+
+def write_player_store(table: pa.Table, path: str = PLAYER_STORE_PATH):
+    """Write the Arrow file next to `path` and atomically swap it in."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@traced
+def refresh_player_store(path: str = PLAYER_STORE_PATH):
+    """Stream /players/nfl into a new store file and swap it in."""
+    with sleeper_stream("players/nfl") as resp:
+        table = players_to_table(iter_object_items(resp.iter_content(chunk_size=64 * 1024)))
+    write_player_store(table, path)
+
+
+_lock = threading.Lock()
+_store = None
+_refresher = None
+
+
+def _refresh_loop(interval: float):
+    while True:
+        try:
+            age = time.time() - os.stat(PLAYER_STORE_PATH).st_mtime
+        except OSError:
+            age = interval
+        if age >= interval:
+            try:
+                refresh_player_store()
+            except Exception as e:
+                print(f"Error refreshing player store: {e}")
+                age = interval - 15 * 60  # retry in 15 minutes
+            else:
+                age = 0
+        time.sleep(max(interval - age, 60))
+
+
+def start_background_refresh(interval: float = PLAYER_REFRESH_INTERVAL):
+    """Start the process-wide refresh thread (no-op if it is already running)."""
+    global _refresher
+    with _lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_loop, args=(interval,), name="player-store-refresh", daemon=True)
+            _refresher.start()
+
+
+def get_player_store(block: bool = True) -> PlayerStore:
+    """
+    The process-wide PlayerStore. Downloads the file on first use, picks up a
+    file swapped in by the refresher, and makes sure the refresher is running.
+    block=False (page renders): without a file yet, return None and leave the
+    download to the refresher instead of waiting for it.
+    """
+    global _store
+    if not block and not os.path.exists(PLAYER_STORE_PATH):
+        start_background_refresh()
+        return None
+    with _lock:
+        if not os.path.exists(PLAYER_STORE_PATH):
+            refresh_player_store()
+        if _store is None or os.stat(PLAYER_STORE_PATH).st_mtime != _store.mtime:
+            _store = PlayerStore(PLAYER_STORE_PATH)
+        store = _store
+    start_background_refresh()
+    return store
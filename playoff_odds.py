@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import traced
+from matchup_history import get_history
+
+# -------------------------
+# Monte Carlo playoff odds
+# -------------------------
+# Each team's weekly score is modelled as a normal distribution fitted to the
+# points it has scored so far (shrunk toward the league average early in the
+# season). Every remaining regular-season week of the Sleeper schedule is played
+# out for all simulated seasons at once -- arrays of shape (seasons, weeks, teams)
+# -- and teams are seeded by wins, then points for, as Sleeper does.
+
+SIMULATIONS = 100_000
+BATCH_ELEMENTS = 4_000_000  # simulated team-weeks per batch (~16 MB of float32 scores)
+PRIOR_WEEKS = 3  # weight of the league-wide average in a team's scoring model, in weeks
+PRIOR_MEAN, PRIOR_STD = 100.0, 20.0  # before any week has been played
+MIN_STD = 5.0
+
+
+def playoff_byes(playoff_teams: int) -> int:
+    """Teams that skip the first round in a bracket of `playoff_teams` (6 -> 2, 4 -> 0)."""
+    bracket = 1 << max(playoff_teams - 1, 0).bit_length()
+    return bracket - playoff_teams
+
+
+def build_season(snapshot) -> dict:
+    """
+    Simulator inputs from a LeagueSnapshot and its matchup history:
+    roster_ids, wins and points for so far, past weekly points (teams x weeks,
+    NaN where missing) and the remaining schedule as opponent indices
+    (weeks x teams, -1 for no game).
+    """
+    roster_ids = sorted(r["roster_id"] for r in snapshot.rosters)
+    index = {rid: i for i, rid in enumerate(roster_ids)}
+    settings = {r["roster_id"]: r.get("settings", {}) for r in snapshot.rosters}
+    wins = np.array([settings[rid].get("wins", 0) + 0.5 * settings[rid].get("ties", 0) for rid in roster_ids], float)
+    points_for = np.array([settings[rid].get("fpts", 0) + settings[rid].get("fpts_decimal", 0) / 100
+                           for rid in roster_ids], float)
+
+    current_week = snapshot.current_week
+    last_week = snapshot.regular_season_weeks
+
+    # Played weeks come from the matchup history store; only the remaining schedule is fetched
+    past_weeks = list(range(1, min(current_week, last_week + 1)))
+    weekly_points = get_history(snapshot.league_id).weekly_points()
+    history = weekly_points.reindex(index=past_weeks, columns=roster_ids).to_numpy(float).T
+
+    remaining_weeks = list(range(current_week, last_week + 1))
+    snapshot.prefetch_matchups(remaining_weeks)
+    opponents = np.full((len(remaining_weeks), len(roster_ids)), -1)
+    for w, week in enumerate(remaining_weeks):
+        games = {}
+        for m in snapshot.matchups(week):
+            if m.get("roster_id") in index and m.get("matchup_id"):
+                games.setdefault(m["matchup_id"], []).append(index[m["roster_id"]])
+        for teams in games.values():
+            if len(teams) == 2:
+                opponents[w, teams[0]], opponents[w, teams[1]] = teams[1], teams[0]
+
+    return {"roster_ids": roster_ids, "wins": wins, "points_for": points_for,
+            "history": history, "opponents": opponents}
+
+
+def scoring_model(history: np.ndarray):
+    """Per-team (mean, std) of weekly points, shrunk toward the league-wide figures."""
+    played = np.isfinite(history)
+    n = played.sum(axis=1)
+    if not played.any():
+        teams = history.shape[0]
+        return np.full(teams, PRIOR_MEAN), np.full(teams, PRIOR_STD)
+
+    league_mean = np.nanmean(history)
+    league_var = np.nanvar(history) if played.sum() > 1 else PRIOR_STD ** 2
+    totals = np.where(played, history, 0.0)
+    team_mean = totals.sum(axis=1) / np.maximum(n, 1)
+    team_var = (np.where(played, history - team_mean[:, None], 0.0) ** 2).sum(axis=1) / np.maximum(n - 1, 1)
+
+    mean = (n * team_mean + PRIOR_WEEKS * league_mean) / (n + PRIOR_WEEKS)
+    var = (np.maximum(n - 1, 0) * team_var + PRIOR_WEEKS * league_var) / (np.maximum(n - 1, 0) + PRIOR_WEEKS)
+    return mean, np.maximum(np.sqrt(var), MIN_STD)
+
+
+def simulate_seasons(wins, points_for, opponents, mean, std, n_sims: int = SIMULATIONS, seed=None) -> dict:
+    """
+    Play out the remaining schedule `n_sims` times.
+    Returns seed_probs (teams x seeds: probability of finishing at each seed)
+    and expected_wins (teams,).
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(wins)
+    n_weeks = opponents.shape[0]
+    has_game = opponents >= 0
+    opponent = np.where(has_game, opponents, np.arange(n_teams))  # no game: "plays" itself, never wins
+    week_index = np.arange(n_weeks)[:, None]
+    mean32, std32 = mean.astype(np.float32), std.astype(np.float32)
+
+    seed_counts = np.zeros(n_teams * n_teams, dtype=np.int64)
+    total_wins = 0.0
+    batch = max(1, BATCH_ELEMENTS // max(n_weeks * n_teams, 1))
+    for start in range(0, n_sims, batch):
+        n = min(batch, n_sims - start)
+        scores = rng.standard_normal((n, n_weeks, n_teams), dtype=np.float32) * std32 + mean32
+        np.maximum(scores, 0, out=scores)
+        won = (scores > scores[:, week_index, opponent]) & has_game
+
+        season_wins = wins + won.sum(axis=1)
+        season_pf = points_for + np.where(has_game, scores, 0).sum(axis=1)
+        # Wins first, points for as the tiebreak (PF never reaches 1e6)
+        order = np.argsort(-(season_wins * 1e6 + season_pf), axis=1, kind="stable")  # order[s, seed] = team
+        seed_counts += np.bincount((order * n_teams + np.arange(n_teams)).ravel(), minlength=n_teams * n_teams)
+        total_wins = total_wins + season_wins.sum(axis=0)
+
+    return {
+        "seed_probs": seed_counts.reshape(n_teams, n_teams) / n_sims,
+        "expected_wins": total_wins / n_sims,
+    }
+
+
+@traced
+def get_playoff_odds(snapshot, n_sims: int = SIMULATIONS, seed=None) -> pd.DataFrame:
+    """
+    Playoff, bye and seed probabilities per team from simulated seasons.
+    Columns: ['Owner', 'Proj Wins', 'Playoff %', 'Bye %', 'Seed 1 %', ..., 'Seed N %']
+    """
+    if not snapshot.rosters:
+        return pd.DataFrame()
+    season = build_season(snapshot)
+    mean, std = scoring_model(season["history"])
+    sim = simulate_seasons(season["wins"], season["points_for"], season["opponents"], mean, std, n_sims, seed)
+
+    settings = snapshot.league.get("settings", {})
+    playoff_teams = min(settings.get("playoff_teams", 6), len(season["roster_ids"]))
+    byes = playoff_byes(playoff_teams)
+    seed_probs = sim["seed_probs"]
+
+    df = pd.DataFrame({
+        "Owner": [snapshot.roster_to_owner.get(rid, f"Team {rid}") for rid in season["roster_ids"]],
+        "Proj Wins": sim["expected_wins"].round(1),
+        "Playoff %": (100 * seed_probs[:, :playoff_teams].sum(axis=1)).round(1),
+        "Bye %": (100 * seed_probs[:, :byes].sum(axis=1)).round(1),
+    })
+    for s in range(playoff_teams):
+        df[f"Seed {s + 1} %"] = (100 * seed_probs[:, s]).round(1)
+    return df.sort_values(["Playoff %", "Proj Wins"], ascending=False).reset_index(drop=True)
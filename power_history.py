@@ -0,0 +1,119 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import traced
+from matchup_history import _league_dir, get_history
+from utils import calculate_power_scores
+
+# -------------------------
+# Power rankings history
+# -------------------------
+# Power Score after every completed week, kept next to the league's matchup
+# history as power.parquet. Each update only scores the weeks completed since
+# the last one: the running record (wins, losses, points for) is carried over
+# from the last stored week and the new week's results are added to it, so the
+# cost per refresh is one week of one league, however long the season.
+#
+# Each row records the mtime of the history file its week was scored from. When
+# the history sync rewrites a week (late scores, stat corrections), that week and
+# every later one are dropped and scored again. Rows also record a fingerprint
+# of the draft grades they were scored with: when the grades change, every week
+# is scored again, so the whole history uses the same grades. Without draft
+# grades nothing is scored.
+
+POWER_COLUMNS = ["week", "roster_id", "Owner", "Wins", "Losses", "PF", "Draft Score", "Power Score", "history_mtime",
+                 "draft_hash"]
+
+
+def _power_path(league_id: str) -> str:
+    return os.path.join(_league_dir(league_id), "power.parquet")
+
+
+def draft_hash(draft_grades_df: pd.DataFrame) -> str:
+    """Fingerprint of the draft grades a week is scored with (scores rounded past float noise)."""
+    grades = draft_grades_df[["Owner", "Draft Score"]].sort_values("Owner").reset_index(drop=True)
+    grades["Draft Score"] = grades["Draft Score"].astype(float).round(4)
+    return hashlib.sha1(pd.util.hash_pandas_object(grades, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def load_power_history(league_id: str) -> pd.DataFrame:
+    """Stored power history (POWER_COLUMNS), empty if there is none yet."""
+    try:
+        return pd.read_parquet(_power_path(league_id))
+    except OSError:
+        return pd.DataFrame(columns=POWER_COLUMNS)
+
+
+def _write_power_history(league_id: str, df: pd.DataFrame):
+    path = _power_path(league_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@traced
+def update_power_history(snapshot, draft_grades_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Score every completed week (before the snapshot's current week) that is in
+    the matchup history but not yet in the power history -- or was rewritten
+    since it was scored -- in order, and store the result. Returns the full
+    history (POWER_COLUMNS); with no draft grades the stored history is
+    returned unchanged.
+    """
+    stored = load_power_history(snapshot.league_id)
+    history = get_history(snapshot.league_id)
+    roster_ids = sorted(snapshot.roster_to_owner)
+    if not roster_ids or draft_grades_df.empty:
+        return stored
+    grades_hash = draft_hash(draft_grades_df)
+
+    # Drop everything from the first week whose history file changed after it was
+    # scored, or that was scored with different draft grades
+    if not stored.empty:
+        scored_from = stored["history_mtime"] if "history_mtime" in stored else pd.Series(np.nan, index=stored.index)
+        scored_with = stored["draft_hash"] if "draft_hash" in stored else pd.Series(None, index=stored.index)
+        stale = stored["week"].map(history.files).ne(scored_from) | scored_with.ne(grades_hash)
+        if stale.any():
+            stored = stored[stored["week"] < stored.loc[stale, "week"].min()]
+
+    # Running record after the last stored week
+    record = pd.DataFrame({"Wins": 0, "Losses": 0, "PF": 0.0}, index=pd.Index(roster_ids, name="roster_id"))
+    last_week = 0
+    if not stored.empty:
+        last_week = int(stored["week"].max())
+        last = stored[stored["week"] == last_week].set_index("roster_id")
+        record.update(last[["Wins", "Losses", "PF"]])
+        record = record.astype({"Wins": int, "Losses": int})
+
+    new_rows = []
+    week = last_week + 1
+    # Weeks are added strictly in order; a gap in the matchup history waits for the next sync
+    while week < snapshot.current_week and week in history.files:
+        results = history.week(week).set_index("roster_id").reindex(roster_ids)
+        record["Wins"] += (results["result"] == "W").to_numpy().astype(int)
+        record["Losses"] += (results["result"] == "L").to_numpy().astype(int)
+        record["PF"] += results["points"].fillna(0).to_numpy()
+
+        standings = record.reset_index()
+        standings["Owner"] = standings["roster_id"].map(snapshot.roster_to_owner)
+        scores = calculate_power_scores(standings, draft_grades_df, snapshot, week=week + 1)
+        new_rows.append(scores.assign(week=week, history_mtime=history.files[week], draft_hash=grades_hash)[POWER_COLUMNS])
+        week += 1
+
+    if not new_rows:
+        return stored
+    updated = pd.concat([stored] + new_rows, ignore_index=True) if not stored.empty else pd.concat(new_rows)
+    updated = updated.astype({"week": np.int16, "roster_id": np.int32}).reset_index(drop=True)
+    _write_power_history(snapshot.league_id, updated)
+    return updated
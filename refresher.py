@@ -0,0 +1,333 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from disk_cache import CACHE_DIR
+from functions import league_ids as CONFIGURED_LEAGUE_IDS
+from instrumentation import finish_render, note_cache, traced
+from matchup_history import sync_history
+from matchup_odds import add_matchup_odds, get_win_probabilities
+from matchup_recap import cache_week_recaps
+from player_store import get_player_store
+from playoff_odds import get_playoff_odds
+from power_history import update_power_history
+from trade_engine import trade_need
+from trade_values import get_trade_values, value_params
+from transaction_history import get_transactions, sync_transactions
+from utils import (
+    LeagueSnapshot, get_standings, get_draft_grades, get_all_projections, score_draft_picks,
+    calculate_power_scores, get_matchups_with_owners, fetch_weekly_projections, get_player_map,
+    get_starters_df, get_player_info, add_league_vorp_columns
+)
+
+# -------------------------
+# Precomputed page snapshots
+# -------------------------
+# A refresher runs the utils pipeline for every configured league on a schedule
+# and writes each league's tables as one versioned snapshot:
+#
+#   .cache/snapshots/<league_id>/<version>/{meta.json, standings.parquet, ...}
+#   .cache/snapshots/<league_id>/LATEST      -> "<version>"
+#
+# A version directory is complete before LATEST is swapped (os.replace) to point
+# at it, so pages only ever read whole snapshots. Pages render from the latest
+# snapshot; the network is only hit when a user presses "Refresh now".
+#
+# Runs as a daemon thread inside the Streamlit process, or on its own:
+#   python refresher.py          # loop forever
+#   python refresher.py --once   # one pass over every league
+# Set SWISH_REFRESHER=external when running it separately, so the app does not
+# start a second one.
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")
+SNAPSHOT_INTERVAL = float(os.environ.get("SWISH_SNAPSHOT_INTERVAL", 15 * 60))
+SNAPSHOT_KEEP = 5  # versions kept per league
+
+LEAGUE_IDS = [lid for lid in os.environ.get("SWISH_LEAGUE_IDS", ",".join(CONFIGURED_LEAGUE_IDS)).split(",") if lid]
+
+TABLES = ("standings", "draft_grades", "draft_picks", "power_scores", "matchups", "starters", "playoff_odds",
+          "power_history", "owners", "positional_need")
+
+
+@traced
+def build_league_tables(snapshot: LeagueSnapshot, vorp_df: pd.DataFrame = None) -> dict:
+    """
+    Every table the pages render for one league, computed from a LeagueSnapshot.
+    vorp_df: projections with the league's VORP (from refresh_leagues' batch); fetched if omitted.
+    """
+    standings = get_standings(snapshot)
+    draft_grades = get_draft_grades(snapshot, vorp_df)
+
+    draft_picks = pd.DataFrame(columns=["roster_id", "player_id", "Player", "Value", "Owner"])
+    if snapshot.picks:
+        proj_df = get_all_projections() if vorp_df is None else vorp_df
+        if not proj_df.empty:
+            draft_picks = score_draft_picks(snapshot.picks, proj_df, snapshot.league)
+            draft_picks["Owner"] = draft_picks["roster_id"].map(
+                lambda rid: snapshot.roster_to_owner.get(rid, f"Team {rid}"))
+
+    power_scores = pd.DataFrame(columns=["Owner", "Power Score"])
+    if not standings.empty and not draft_grades.empty:
+        power_scores = calculate_power_scores(standings, draft_grades, snapshot)
+
+    matchups_week = snapshot.matchups()
+    matchups = get_matchups_with_owners(snapshot, power_scores)
+    starters = get_starters_df(matchups_week, None, snapshot.roster_to_owner,
+                               fetch_weekly_projections(snapshot.current_week, snapshot.league), get_player_map())
+    transactions = get_transactions(snapshot.league_id)
+
+    return {
+        "standings": standings,
+        "draft_grades": draft_grades,
+        "draft_picks": draft_picks,
+        "power_scores": power_scores,
+        "matchups": matchups,
+        "starters": starters,
+        "playoff_odds": get_playoff_odds(snapshot),
+        "power_history": update_power_history(snapshot, draft_grades),
+        "owners": pd.DataFrame({"roster_id": list(snapshot.roster_to_owner),
+                                "Owner": list(snapshot.roster_to_owner.values())}),
+        "positional_need": trade_need(transactions.trades(), transactions.moves, snapshot.rosters,
+                                      snapshot.league.get("roster_positions"), get_player_info()["position"]),
+    }
+
+
+def add_win_probabilities(tables_by_league: dict):
+    """
+    Projected totals and win probabilities for every matchup of every league in
+    one pass over all starters; added to each league's matchups table in place.
+    """
+    starters = [tables["starters"].assign(**{"League ID": league_id})
+                for league_id, tables in tables_by_league.items() if not tables["starters"].empty]
+    if not starters:
+        return
+    team_odds = get_win_probabilities(pd.concat(starters, ignore_index=True))
+    for league_id, tables in tables_by_league.items():
+        tables["matchups"] = add_matchup_odds(tables["matchups"], team_odds[team_odds["League ID"] == league_id])
+
+
+def _league_dir(league_id: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, str(league_id))
+
+
+def write_snapshot(league_id: str, tables: dict, meta: dict) -> str:
+    """Write one snapshot version, point LATEST at it and prune old versions."""
+    league_dir = _league_dir(league_id)
+    os.makedirs(league_dir, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+    tmp_dir = tempfile.mkdtemp(dir=league_dir, prefix=".tmp-")
+    try:
+        for name, df in tables.items():
+            df.to_parquet(os.path.join(tmp_dir, f"{name}.parquet"))
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(dict(meta, version=version), f)
+        os.replace(tmp_dir, os.path.join(league_dir, version))
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    fd, tmp_path = tempfile.mkstemp(dir=league_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(league_dir, "LATEST"))
+
+    versions = sorted(v for v in os.listdir(league_dir) if not v.startswith(".") and v != "LATEST"
+                      and not v.endswith(".tmp"))
+    for old in versions[:-SNAPSHOT_KEEP]:
+        shutil.rmtree(os.path.join(league_dir, old), ignore_errors=True)
+    return version
+
+
+_refresh_lock = threading.Lock()  # one refresh at a time: background thread and "Refresh now" clicks
+
+
+def refresh_leagues(league_ids=None) -> dict:
+    """
+    Fetch and snapshot the given leagues (default: every configured league).
+    Returns {league_id: version}; a league that fails is printed and skipped.
+    A refresh already in progress is waited for rather than run alongside.
+    """
+    with _refresh_lock:
+        return _refresh_leagues(list(league_ids or LEAGUE_IDS))
+
+
+def _refresh_leagues(league_ids: list) -> dict:
+    built = {}
+    snapshots = LeagueSnapshot.load_many(league_ids, with_matchups=True)
+    try:
+        get_player_store()  # built here, ahead of the pages, which never wait for the download
+    except Exception as e:
+        print(f"Error building player store: {e}")
+
+    # VORP under every league's scoring and replacement levels in one batch
+    proj_df = get_all_projections()
+    vorp_dfs = {}
+    if not proj_df.empty:
+        try:
+            vorp_dfs = add_league_vorp_columns(proj_df, {lid: s.league for lid, s in snapshots.items()})
+        except Exception as e:
+            print(f"Error computing VORP: {e}")
+
+    for snapshot in snapshots.values():
+        vorp_df = vorp_dfs.get(snapshot.league_id)
+        try:
+            sync_history(snapshot.league_id, snapshot.current_week)
+            sync_transactions(snapshot.league_id, snapshot.current_week)
+            get_trade_values(snapshot.league)  # warm the FantasyCalc cache the Trade Analyzer reads
+            built[snapshot.league_id] = (snapshot, build_league_tables(snapshot, vorp_df))
+            cache_week_recaps(snapshot, vorp_df)  # the Matchup Summary only reads cached recaps
+        except Exception as e:
+            print(f"Error refreshing snapshot for league {snapshot.league_id}: {e}")
+    try:
+        add_win_probabilities({league_id: tables for league_id, (_, tables) in built.items()})
+    except Exception as e:
+        # Snapshots are still written, just without the odds columns (pages fall back without them)
+        print(f"Error computing win probabilities: {e}")
+
+    versions = {}
+    for snapshot, tables in built.values():
+        try:
+            meta = {
+                "league_id": snapshot.league_id,
+                "league_name": snapshot.name,
+                "week": snapshot.current_week,
+                "draft_time": str(snapshot.draft_time) if snapshot.draft_time else None,
+                "value_params": value_params(snapshot.league),
+                "created_at": time.time(),
+            }
+            versions[snapshot.league_id] = write_snapshot(snapshot.league_id, tables, meta)
+        except Exception as e:
+            print(f"Error refreshing snapshot for league {snapshot.league_id}: {e}")
+    return versions
+
+
+# -------------------------
+# Reading snapshots
+# -------------------------
+
+_lock = threading.Lock()
+_memo = {}  # league_id -> (version, tables)
+_refresher = None
+
+
+def latest_version(league_id: str):
+    try:
+        with open(os.path.join(_league_dir(league_id), "LATEST")) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+@traced
+def load_snapshot(league_id: str):
+    """
+    The latest snapshot for a league as {"meta": {...}, <table>: DataFrame, ...},
+    or None if none has been written yet. Memoized per version.
+    """
+    version = latest_version(league_id)
+    if version is None:
+        return None
+    with _lock:
+        cached = _memo.get(league_id)
+        if cached and cached[0] == version:
+            note_cache(True)
+            return cached[1]
+    note_cache(False)
+
+    path = os.path.join(_league_dir(league_id), version)
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            snapshot = {"meta": json.load(f)}
+        for name in TABLES:
+            table_path = os.path.join(path, f"{name}.parquet")
+            # Versions written before a table existed simply lack it
+            snapshot[name] = pd.read_parquet(table_path) if os.path.exists(table_path) else pd.DataFrame()
+    except OSError as e:
+        print(f"Error loading snapshot {version} for league {league_id}: {e}")
+        return None
+
+    with _lock:
+        _memo[league_id] = (version, snapshot)
+    return snapshot
+
+
+def get_snapshot_league_names(league_ids: dict):
+    """
+    League names from snapshot metadata. A league without a snapshot yet is
+    labelled by its ID until the refresher writes one (no live fetch in a render).
+    """
+    for lid in league_ids:
+        snapshot = load_snapshot(lid)
+        league_ids[lid] = snapshot["meta"]["league_name"] if snapshot else lid
+    return league_ids
+
+
+def _snapshot_age() -> float:
+    """Seconds since the stalest league snapshot was written (inf if one is missing)."""
+    ages = []
+    for lid in LEAGUE_IDS:
+        snapshot = load_snapshot(lid)
+        ages.append(time.time() - snapshot["meta"]["created_at"] if snapshot else float("inf"))
+    return max(ages, default=float("inf"))
+
+
+def _refresh_loop(interval: float):
+    while True:
+        age = _snapshot_age()
+        if age >= interval:
+            try:
+                refresh_leagues()
+            except Exception as e:
+                print(f"Error refreshing snapshots: {e}")
+            age = 0
+        time.sleep(max(interval - age, 60))
+
+
+def start_background_refresher(interval: float = SNAPSHOT_INTERVAL):
+    """Start the process-wide snapshot thread (no-op if running, or if run externally)."""
+    global _refresher
+    if os.environ.get("SWISH_REFRESHER") == "external":
+        return
+    with _lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresh_loop, args=(interval,), name="snapshot-refresh", daemon=True)
+            _refresher.start()
+
+
+def page_snapshot(league_id: str) -> dict:
+    """
+    Latest snapshot for a page render. A sidebar "Refresh now" button is the only
+    thing that fetches live; without any snapshot yet the page stops with a hint.
+    """
+    start_background_refresher()
+    refreshing = _refresh_lock.locked()
+    if st.sidebar.button("🔄 Refresh now", disabled=refreshing):
+        with st.spinner("Fetching the latest league data..."):
+            refresh_leagues([league_id])
+    if refreshing:
+        st.sidebar.caption("Refreshing league data...")
+
+    snapshot = load_snapshot(league_id)
+    if snapshot is None:
+        st.info("League data is still being prepared. Press \"Refresh now\" to fetch it.")
+        finish_render()
+        st.stop()
+    as_of = datetime.fromtimestamp(snapshot["meta"]["created_at"]).strftime("%b %d, %I:%M %p")
+    st.sidebar.caption(f"Data as of {as_of} (week {snapshot['meta']['week']})")
+    return snapshot
+
+
+if __name__ == "__main__":
+    if "--once" in sys.argv:
+        print(refresh_leagues())
+    else:
+        _refresh_loop(SNAPSHOT_INTERVAL)
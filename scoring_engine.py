@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import traced
+
+# -------------------------
+# League scoring engine
+# -------------------------
+# FantasyPros' FPTS column is one generic scoring system. Every Sleeper league
+# has its own scoring_settings (points per reception, per passing TD, ...), which
+# are linear in the projected stats: each league is a weight vector over the
+# stat columns, and projected points for every player under every league are
+# one (players x stats) @ (stats x leagues) product over the projections that
+# are already cached -- no per-league download.
+#
+# Kickers and defenses are scored by field-goal distance and points-allowed
+# tiers that the projections do not break out, so those rows keep FPTS, as
+# does any league without scoring_settings.
+
+# FantasyPros stat column -> Sleeper scoring key
+STAT_KEYS = {
+    'PASSING_ATT': 'pass_att', 'PASSING_CMP': 'pass_cmp', 'PASSING_YDS': 'pass_yd', 'PASSING_TDS': 'pass_td',
+    'PASSING_INTS': 'pass_int', 'RUSHING_ATT': 'rush_att', 'RUSHING_YDS': 'rush_yd', 'RUSHING_TDS': 'rush_td',
+    'RECEIVING_REC': 'rec', 'RECEIVING_YDS': 'rec_yd', 'RECEIVING_TDS': 'rec_td', 'MISC_FL': 'fum_lost',
+}
+# Per-position reception bonuses (TE premium, ...): receptions again, only for that position's rows
+POSITION_BONUSES = {'bonus_rec_rb': 'RB', 'bonus_rec_wr': 'WR', 'bonus_rec_te': 'TE'}
+SCORING_KEYS = list(STAT_KEYS.values()) + list(POSITION_BONUSES)
+SCORED_POSITIONS = ('QB', 'RB', 'WR', 'TE')
+
+
+def scoring_weights(scoring_settings: dict) -> np.ndarray:
+    """Points per unit of each SCORING_KEYS stat under a Sleeper league's scoring_settings."""
+    scoring_settings = scoring_settings or {}
+    return np.array([float(scoring_settings.get(key) or 0) for key in SCORING_KEYS])
+
+
+def stat_matrix(proj_df: pd.DataFrame) -> np.ndarray:
+    """players x SCORING_KEYS matrix of projected stats (0 where a column is missing or empty)."""
+    stats = np.zeros((len(proj_df), len(SCORING_KEYS)))
+    for j, col in enumerate(STAT_KEYS):
+        if col in proj_df.columns:
+            stats[:, j] = pd.to_numeric(proj_df[col], errors='coerce').fillna(0).to_numpy(float)
+    rec = stats[:, SCORING_KEYS.index('rec')]
+    position = proj_df['Position'].astype(object).to_numpy()
+    for j, pos in enumerate(POSITION_BONUSES.values(), start=len(STAT_KEYS)):
+        stats[:, j] = np.where(position == pos, rec, 0)
+    return stats
+
+
+@traced
+def league_points(proj_df: pd.DataFrame, leagues: dict) -> pd.DataFrame:
+    """
+    Projected points for every row of proj_df under every league's scoring.
+
+    proj_df: projections with 'Position', 'FPTS' and FantasyPros stat columns
+    leagues: {key: Sleeper league dict (or None for FPTS)}
+    Returns a DataFrame on proj_df's index with one column per key of `leagues`.
+    """
+    scoring = [(league or {}).get('scoring_settings') or {} for league in leagues.values()]
+    weights = np.zeros((len(SCORING_KEYS), len(scoring)))
+    for j, settings in enumerate(scoring):
+        weights[:, j] = scoring_weights(settings)
+    points = stat_matrix(proj_df) @ weights
+
+    # FPTS for K / DST, rows without stat columns and leagues without scoring settings
+    fpts = pd.to_numeric(proj_df['FPTS'], errors='coerce').to_numpy(float)
+    has_stats = proj_df.reindex(columns=list(STAT_KEYS)).notna().any(axis=1).to_numpy()
+    scored_rows = proj_df['Position'].isin(SCORED_POSITIONS).to_numpy() & has_stats
+    scored_leagues = np.array([bool(settings) for settings in scoring], dtype=bool)
+    points = np.where(scored_rows[:, None] & scored_leagues[None, :], points, fpts[:, None])
+    return pd.DataFrame(points, index=proj_df.index, columns=list(leagues))
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import http_replay
+from instrumentation import propagate, span
+
+# -------------------------
+# Shared HTTP client
+# -------------------------
+
+# Upstreams; overridable to point the app at a local stand-in (benchmarks/load_test.py)
+SLEEPER_BASE_URL = os.environ.get("SWISH_SLEEPER_BASE_URL", "https://api.sleeper.app/v1")
+FANTASYPROS_BASE_URL = os.environ.get("SWISH_FANTASYPROS_BASE_URL", "https://www.fantasypros.com")
+FANTASYCALC_BASE_URL = os.environ.get("SWISH_FANTASYCALC_BASE_URL", "https://api.fantasycalc.com")
+
+# (connect, read) seconds -- a hung socket should never stall a page render
+DEFAULT_TIMEOUT = (3.05, 15)
+
+# Sleeper asks clients to stay under 1000 calls/minute
+SLEEPER_RATE_PER_SEC = 10
+SLEEPER_BURST = 20
+
+
+class TokenBucket:
+    """Thread-safe token bucket. `acquire()` blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _build_session() -> requests.Session:
+    """One pooled keep-alive session with bounded retries + exponential backoff."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,  # 0.5s, 1s, 2s
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _build_session()
+_sleeper_bucket = TokenBucket(SLEEPER_RATE_PER_SEC, SLEEPER_BURST)
+
+
+def _throttle():
+    # Replayed responses never reach Sleeper, so they are not rate limited
+    if http_replay.HTTP_MODE != "replay":
+        _sleeper_bucket.acquire()
+
+# Shared worker pool for fan-out fetches; sized to the session's connection pool
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="sleeper")
+
+
+def http_get(url: str, timeout=DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    GET through the shared pooled session (FantasyPros, FantasyCalc, ...).
+    Recorded or replayed instead when SWISH_HTTP_MODE is record / replay.
+    """
+    parts = urlsplit(url)
+    with span(f"http {parts.netloc}", kind="http", path=parts.path) as s:
+        resp = http_replay.get(_session, url, timeout=timeout, **kwargs)
+        s.attrs["status"] = resp.status_code
+        if kwargs.get("stream"):
+            s.bytes = int(resp.headers.get("Content-Length") or 0)
+        else:
+            s.bytes = len(resp.content)
+    return resp
+
+
+def sleeper_get(path: str, timeout=DEFAULT_TIMEOUT):
+    """
+    Rate-limited GET against the Sleeper API, e.g. sleeper_get(f"league/{league_id}/users").
+    Raises requests.HTTPError on a non-2xx response; returns the decoded JSON.
+    """
+    _throttle()
+    resp = http_get(f"{SLEEPER_BASE_URL}/{path.lstrip('/')}", timeout=timeout)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def sleeper_get_many(paths, timeout=DEFAULT_TIMEOUT) -> dict:
+    """
+    Fetch several Sleeper paths concurrently, so latency is set by the slowest call.
+    Returns {path: json}; a path that fails maps to None (and the error is printed).
+    """
+    paths = list(dict.fromkeys(paths))
+    futures = {path: _executor.submit(propagate(sleeper_get), path, timeout) for path in paths}
+    results = {}
+    for path, future in futures.items():
+        try:
+            results[path] = future.result()
+        except Exception as e:
+            print(f"Error fetching {path}: {e}")
+            results[path] = None
+    return results
+
+
+def sleeper_stream(path: str, timeout=DEFAULT_TIMEOUT) -> requests.Response:
+    """
+    Rate-limited streaming GET against the Sleeper API, for large payloads
+    (/players/nfl). Returns the open Response; use it as a context manager.
+    """
+    _throttle()
+    resp = http_get(f"{SLEEPER_BASE_URL}/{path.lstrip('/')}", timeout=timeout, stream=True)
+    try:
+        resp.raise_for_status()
+    except requests.HTTPError:
+        resp.close()
+        raise
+    return resp
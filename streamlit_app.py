@@ -1,7 +1,9 @@
 import streamlit as st
-import requests
 import pandas as pd
 
+from refresher import get_snapshot_league_names, page_snapshot
+from instrumentation import finish_render, start_render
+
 st.set_page_config(
     page_title="Swish Standings",  # This changes the browser tab title
     page_icon="🏈",                 # Optional: adds an emoji icon in the tab
@@ -9,6 +11,7 @@ st.set_page_config(
 )
 
 st.title("🏈 Swish League Standings")
+start_render("Standings")
 
 # ------------------------
 # League selection
@@ -20,15 +23,8 @@ league_ids = {
     "1264094054845513728": None,
 }
 
-# Fetch league names
-for lid in league_ids.keys():
-    try:
-        resp = requests.get(f"https://api.sleeper.app/v1/league/{lid}")
-        resp.raise_for_status()
-        data = resp.json()
-        league_ids[lid] = data.get("name", f"League {lid}")
-    except:
-        league_ids[lid] = f"League {lid}"
+# League names (from the latest snapshots)
+league_ids = get_snapshot_league_names(league_ids)
 
 league_id = st.sidebar.selectbox(
     "Select League",
@@ -38,40 +34,22 @@ league_id = st.sidebar.selectbox(
 selected_league_name = league_ids[league_id]
 
 # ------------------------
-# Fetch rosters + users
+# Standings from the latest snapshot
 # ------------------------
-league_resp = requests.get(f"https://api.sleeper.app/v1/league/{league_id}").json()
-users = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/users").json()
-rosters = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/rosters").json()
-
-# Map roster_id -> display_name
-roster_to_owner = {}
-for roster in rosters:
-    roster_id = roster["roster_id"]
-    owner_id = roster["owner_id"]
-    user = next((u for u in users if u["user_id"] == owner_id), None)
-    roster_to_owner[roster_id] = user.get("display_name", f"Team {roster_id}") if user else f"Team {roster_id}"
+standings_df = page_snapshot(league_id)["standings"]
+if standings_df.empty:
+    st.info("No standings available yet.")
+    finish_render()
+    st.stop()
 
 # ------------------------
 # Build table data
 # ------------------------
-table_data = []
-for roster in rosters:
-    owner = roster_to_owner[roster["roster_id"]]
-    wins = roster.get("settings", {}).get("wins", 0)
-    losses = roster.get("settings", {}).get("losses", 0)
-    pf = roster.get("settings", {}).get("fpts", 0.0)
-    pa = roster.get("settings", {}).get("fpts_against", 0.0)  # Points Against
-    table_data.append({
-        "Team Name": owner,
-        "Wins": wins,
-        "Losses": losses,
-        "Points For": round(pf, 2),
-        "Points Against": round(pa, 2)
-    })
-
-df = pd.DataFrame(table_data)
+df = standings_df.rename(columns={"Owner": "Team Name", "PF": "Points For", "PA": "Points Against"})
+df[["Points For", "Points Against"]] = df[["Points For", "Points Against"]].round(2)
 df = df.sort_values(["Wins", "Points For"], ascending=[False, False]).reset_index(drop=True)
 
 st.subheader(f"Standings — {selected_league_name}")
 st.dataframe(df, use_container_width=True)
+
+finish_render()
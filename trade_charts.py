@@ -0,0 +1,79 @@
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from disk_cache import DiskCache
+from instrumentation import span
+
+# -------------------------
+# Trade value charts
+# -------------------------
+# All trades are drawn as grouped horizontal bars (the value each side received,
+# one bar per roster, so multi-team trades show every side), up to
+# TRADES_PER_FIGURE trades per figure. Figures are built with matplotlib's
+# object API rather than pyplot, so they never enter pyplot's global figure
+# registry, and each one is released as soon as it is saved to PNG. The PNGs are
+# cached per (league, page, hash of the trades drawn on it): a rerun with
+# the same trades shows the cached image without drawing anything.
+
+TRADES_PER_FIGURE = 15
+CHART_TTL = float(os.environ.get("SWISH_CHART_TTL", 24 * 60 * 60))
+_chart_cache = DiskCache("trade_charts", ttl=CHART_TTL, max_bytes=32 * 1024 * 1024)
+
+CHART_COLUMNS = ["Trade", "Team", "Players In", "Value In", "Grade"]
+SIDE_COLORS = ["skyblue", "salmon", "palegreen", "plum"]
+
+
+def chart_pages(n_trades: int) -> int:
+    return max(1, -(-n_trades // TRADES_PER_FIGURE))
+
+
+def trades_hash(df: pd.DataFrame) -> str:
+    """Content hash of the trades drawn on one chart."""
+    return hashlib.sha1(pd.util.hash_pandas_object(df[CHART_COLUMNS], index=True).to_numpy().tobytes()).hexdigest()
+
+
+def draw_trade_chart(df: pd.DataFrame) -> bytes:
+    """PNG of one figure with a value bar per side (rows of `df`, top to bottom), grouped by trade."""
+    trade_codes = pd.factorize(df["Trade"])[0]
+    side_no = df.groupby("Trade").cumcount().to_numpy()
+    y = np.arange(len(df)) * 0.45 + trade_codes * 0.5  # a gap between trades
+    fig = Figure(figsize=(8, 1 + 0.45 * len(df) + 0.5 * (trade_codes.max() + 1)))
+    FigureCanvasAgg(fig)
+    try:
+        ax = fig.add_subplot()
+        ax.barh(y, df["Value In"], height=0.4, color=[SIDE_COLORS[i % len(SIDE_COLORS)] for i in side_no])
+        ax.set_yticks(y)
+        ax.set_yticklabels([f"Trade {trade}: {team} ({grade})" if i == 0 else f"{team} ({grade})"
+                            for trade, team, grade, i in zip(df["Trade"], df["Team"], df["Grade"], side_no)],
+                           fontsize="small")
+        for yi, players in zip(y, df["Players In"]):
+            ax.annotate(players, (0, yi), xytext=(3, 0), textcoords="offset points",
+                        va="center", fontsize="x-small")
+        ax.invert_yaxis()
+        ax.set_xlabel("Fantasy Value Received")
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=100)
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+def get_trade_chart(league_id: str, df: pd.DataFrame, page: int = 0) -> bytes:
+    """
+    PNG for page `page` of the trade sides table `df` (CHART_COLUMNS; 'Trade' numbered
+    from 1), cached per (league, page, trades hash).
+    """
+    rows = df[(df["Trade"] > page * TRADES_PER_FIGURE) & (df["Trade"] <= (page + 1) * TRADES_PER_FIGURE)]
+    key = (league_id, page, trades_hash(rows))
+
+    def draw():
+        with span("matplotlib", kind="chart"):
+            return draw_trade_chart(rows)
+    return _chart_cache.get_or_set(key, draw)
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import traced
+
+# -------------------------
+# Batched trade evaluation
+# -------------------------
+# Every trade side -- (league, transaction, roster) -- is a row of two sparse
+# side x player matrices: players received (Sleeper `adds`) and players sent
+# (`drops`). Multiplying them by the player value vector is a bincount over the
+# side codes of the player moves, so all trades of all leagues are valued in a
+# handful of array operations.
+#
+# Positional need scales each player's value for the roster on that side: a
+# team thin at a position (fewer rostered players than starting slots + one
+# backup) gains more from receiving one and loses more by sending one away.
+# Need is measured on each roster as it stood just before the trade: the
+# current rosters with every later move from the transaction store rolled back.
+
+NEED_BONUS = 0.5  # value multiplier at full need: 1 + NEED_BONUS
+FLEX_SLOTS = {"FLEX": ("RB", "WR", "TE"), "WRRB_FLEX": ("RB", "WR"), "REC_FLEX": ("WR", "TE"),
+              "SUPER_FLEX": ("QB", "RB", "WR", "TE")}
+
+SIDE_COLUMNS = ["League ID", "transaction_id", "roster_id", "Players In", "Players Out",
+                "Value In", "Value Out", "Value Delta", "Adj Value In", "Adj Value Out", "Adj Value Delta", "Edge %"]
+
+
+def positional_need(rosters: list, roster_positions: list, player_positions: pd.Series) -> pd.DataFrame:
+    """
+    Need per roster and position, 0 (covered) .. 1 (nobody rostered):
+    ['roster_id', 'position', 'need']
+    rosters: Sleeper rosters (roster_id, players); player_positions: position by player_id.
+    """
+    slots = {}
+    for slot in roster_positions or []:
+        eligible = FLEX_SLOTS.get(slot, (slot,) if slot != "BN" else ())
+        for pos in eligible:
+            slots[pos] = slots.get(pos, 0.0) + 1 / len(eligible)
+    slots = pd.Series(slots, dtype=float)
+
+    held = pd.DataFrame([(r["roster_id"], pid) for r in rosters for pid in r.get("players") or []],
+                        columns=["roster_id", "player_id"])
+    held["position"] = player_positions.astype(object).reindex(held["player_id"]).to_numpy()
+    depth = pd.crosstab(held["roster_id"], held["position"]).reindex(
+        index=[r["roster_id"] for r in rosters], columns=slots.index, fill_value=0)
+
+    wanted = slots.to_numpy() + 1  # starters plus one backup
+    need = np.clip((wanted - depth.to_numpy()) / wanted, 0, 1)
+    return (pd.DataFrame(need, index=depth.index, columns=slots.index)
+              .rename_axis(index="roster_id", columns="position").stack().rename("need").reset_index())
+
+
+def rosters_before(moves: pd.DataFrame, rosters: list, created: int) -> list:
+    """
+    Sleeper rosters as they stood just before `created`, by rolling back every
+    move at or after it. moves: TransactionHistory.moves rows (oldest first) --
+    a player's earliest later move to or from a roster decides whether he was
+    on it: an add means he was not yet, a drop means he still was.
+    """
+    players = {r["roster_id"]: set(r.get("players") or []) for r in rosters}
+    later = moves[moves["created"] >= created].drop_duplicates(["roster_id", "player_id"])
+    for roster_id, player_id, action in later[["roster_id", "player_id", "action"]].itertuples(index=False):
+        if roster_id in players:
+            if action == "add":
+                players[roster_id].discard(player_id)
+            else:
+                players[roster_id].add(player_id)
+    return [{"roster_id": rid, "players": sorted(held)} for rid, held in players.items()]
+
+
+@traced
+def trade_need(trades: pd.DataFrame, moves: pd.DataFrame, rosters: list, roster_positions: list,
+               player_positions: pd.Series) -> pd.DataFrame:
+    """
+    positional_need of every trade's rosters just before the trade:
+    ['transaction_id', 'roster_id', 'position', 'need']
+    trades: TransactionHistory.trades(); moves: TransactionHistory.moves (complete moves are rolled back).
+    """
+    moves = moves[moves["status"] == "complete"]
+    frames = []
+    for transaction_id, created, roster_ids in trades[["transaction_id", "created", "roster_ids"]].itertuples(index=False):
+        before = [r for r in rosters_before(moves, rosters, created) if r["roster_id"] in set(roster_ids)]
+        frames.append(positional_need(before, roster_positions, player_positions).assign(transaction_id=transaction_id))
+    if not frames:
+        return pd.DataFrame(columns=["transaction_id", "roster_id", "position", "need"])
+    return pd.concat(frames, ignore_index=True)[["transaction_id", "roster_id", "position", "need"]]
+
+
+@traced
+def evaluate_trades(moves: pd.DataFrame, values: pd.DataFrame, need: pd.DataFrame,
+                    player_positions: pd.Series) -> pd.DataFrame:
+    """
+    Value every side of every trade in `moves` at once.
+
+    moves:  trade player moves (TransactionHistory.moves rows) with a 'League ID' column
+    values: ['League ID', 'player_id', 'value'] -- each league's FantasyCalc values
+    need:   ['League ID', 'roster_id', 'position', 'need'] -- positional_need per league, or
+            trade_need with 'transaction_id' for the need of each roster at the time of each trade
+
+    Returns one row per side (SIDE_COLUMNS); 'Edge %' is the side's adjusted
+    delta as a percentage of the adjusted value it moved in and out.
+    """
+    if moves.empty:
+        return pd.DataFrame(columns=SIDE_COLUMNS)
+
+    moves = moves[["League ID", "transaction_id", "roster_id", "player_id", "action"]]
+    moves = moves.merge(values[["League ID", "player_id", "value"]], on=["League ID", "player_id"], how="left")
+    moves["position"] = player_positions.astype(object).reindex(moves["player_id"]).to_numpy()
+    need_keys = ["League ID", "transaction_id", "roster_id", "position"] if "transaction_id" in need else \
+                ["League ID", "roster_id", "position"]
+    moves = moves.merge(need[need_keys + ["need"]], on=need_keys, how="left")
+
+    side_codes, sides = pd.factorize(pd.MultiIndex.from_arrays(
+        [moves["League ID"], moves["transaction_id"], moves["roster_id"]]))
+    n_sides = len(sides)
+    value = moves["value"].fillna(0).to_numpy(float)
+    adjusted = value * (1 + NEED_BONUS * moves["need"].fillna(0).to_numpy(float))
+    received = (moves["action"] == "add").to_numpy()
+
+    # side x player matrices times the value vectors
+    value_in = np.bincount(side_codes[received], weights=value[received], minlength=n_sides)
+    value_out = np.bincount(side_codes[~received], weights=value[~received], minlength=n_sides)
+    adj_in = np.bincount(side_codes[received], weights=adjusted[received], minlength=n_sides)
+    adj_out = np.bincount(side_codes[~received], weights=adjusted[~received], minlength=n_sides)
+    moved = adj_in + adj_out
+
+    # Player lists per side: sort moves by (side, in / out) and cut at the group boundaries
+    group = 2 * side_codes + ~received
+    order = np.argsort(group, kind="stable")
+    bounds = np.searchsorted(group[order], np.arange(2 * n_sides + 1))
+    player_ids = moves["player_id"].to_numpy()[order]
+    players = [player_ids[start:stop].tolist() for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    return pd.DataFrame({
+        "League ID": sides.get_level_values(0),
+        "transaction_id": sides.get_level_values(1),
+        "roster_id": sides.get_level_values(2),
+        "Players In": players[0::2],
+        "Players Out": players[1::2],
+        "Value In": value_in,
+        "Value Out": value_out,
+        "Value Delta": value_in - value_out,
+        "Adj Value In": adj_in.round(1),
+        "Adj Value Out": adj_out.round(1),
+        "Adj Value Delta": (adj_in - adj_out).round(1),
+        "Edge %": np.divide(100 * (adj_in - adj_out), moved, out=np.zeros(n_sides), where=moved > 0).round(1),
+    }, columns=SIDE_COLUMNS)
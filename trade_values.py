@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+
+from disk_cache import DiskCache
+from instrumentation import traced
+from sleeper_client import FANTASYCALC_BASE_URL, http_get
+
+# -------------------------
+# FantasyCalc trade values
+# -------------------------
+# FantasyCalc prices players for a league format: dynasty or redraft, 1 or 2
+# starting QBs, team count and points per reception. value_params() reads those
+# from the Sleeper league, and each parameter set's values are cached on disk
+# for VALUE_TTL seconds, indexed by Sleeper player_id -- so every league with
+# the same format shares one download and lookups need no name matching. The
+# refresher refetches values past the TTL; pages read whatever is cached, however
+# old, and never fetch.
+
+VALUE_TTL = float(os.environ.get("SWISH_VALUE_TTL", 6 * 60 * 60))
+_value_cache = DiskCache("fantasycalc_values", ttl=VALUE_TTL, max_bytes=16 * 1024 * 1024)
+
+PPR_STEPS = (0, 0.5, 1)  # the reception values FantasyCalc prices
+VALUE_COLUMNS = ["name", "position", "value"]
+
+
+def value_params(league: dict) -> dict:
+    """FantasyCalc query parameters for a Sleeper league."""
+    league = league or {}
+    settings = league.get("settings", {})
+    roster_positions = league.get("roster_positions") or []
+    rec = (league.get("scoring_settings") or {}).get("rec", 1)
+    return {
+        "isDynasty": "true" if settings.get("type") == 2 else "false",  # Sleeper type 2 = dynasty
+        "numQbs": 2 if "SUPER_FLEX" in roster_positions or roster_positions.count("QB") > 1 else 1,
+        "numTeams": int(league.get("total_rosters") or settings.get("num_teams", 12)),
+        "ppr": min(PPR_STEPS, key=lambda step: abs(step - (rec or 0))),
+    }
+
+
+def parse_values(payload: list) -> pd.DataFrame:
+    """FantasyCalc values/current payload -> DataFrame indexed by Sleeper player_id (VALUE_COLUMNS)."""
+    rows = [(str(p["player"]["sleeperId"]), p["player"].get("name"), p["player"].get("position"), p.get("value", 0))
+            for p in payload if (p.get("player") or {}).get("sleeperId")]
+    df = pd.DataFrame(rows, columns=["player_id"] + VALUE_COLUMNS).drop_duplicates("player_id")
+    df["value"] = df["value"].astype(float)
+    return df.set_index("player_id")
+
+
+@traced
+def get_trade_values(league: dict = None, params: dict = None, fetch: bool = True) -> pd.DataFrame:
+    """
+    FantasyCalc values for the league's format (or for value_params already
+    worked out from it), indexed by Sleeper player_id (VALUE_COLUMNS).
+    Cached per parameter set; empty if FantasyCalc is unavailable.
+    fetch=False (page renders): the cached values regardless of age, empty if
+    there are none yet; never fetches.
+    """
+    params = params or value_params(league)
+    key = tuple(sorted(params.items()))
+    df = _value_cache.get(key, max_age=None if fetch else float("inf"))
+    if df is not None:
+        return df
+    if not fetch:
+        return pd.DataFrame(columns=VALUE_COLUMNS, index=pd.Index([], name="player_id"))
+
+    try:
+        resp = http_get(f"{FANTASYCALC_BASE_URL}/values/current", params=params)
+        resp.raise_for_status()
+        df = parse_values(resp.json())
+    except Exception as e:
+        print(f"Error fetching FantasyCalc values {params}: {e}")
+        return pd.DataFrame(columns=VALUE_COLUMNS, index=pd.Index([], name="player_id"))
+
+    _value_cache.set(key, df)
+    return df
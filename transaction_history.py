@@ -0,0 +1,229 @@
+import json
+import os
+import tempfile
+import threading
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from disk_cache import CACHE_DIR
+from instrumentation import note_cache, traced
+from sleeper_client import sleeper_get_many
+
+# -------------------------
+# League transaction store
+# -------------------------
+# Sleeper pages a league's transactions by round (league/{id}/transactions/{round},
+# one round per week). Each round is stored as one Parquet file:
+#
+#   .cache/transactions/<league_id>/round=<n>.parquet
+#
+# sync_transactions() fetches the rounds with no file yet -- all of them
+# concurrently -- plus the current round, which keeps changing until the week
+# is over, and the previous one, where a trade still pending when the round
+# ended is completed (or vetoed) later; unchanged rounds are not rewritten.
+# Transactions are keyed by transaction_id: one that shows up again (in a later
+# fetch or another round) replaces the earlier copy. Trades, waivers and
+# free-agent moves are all answered from the stored files.
+
+TRANSACTION_DIR = os.path.join(CACHE_DIR, "transactions")
+
+TRANSACTION_SCHEMA = pa.schema([
+    ("transaction_id", pa.string()),
+    ("type", pa.dictionary(pa.int8(), pa.string())),
+    ("status", pa.dictionary(pa.int8(), pa.string())),
+    ("round", pa.int16()),
+    ("created", pa.int64()),
+    ("roster_ids", pa.list_(pa.int32())),
+    ("adds", pa.map_(pa.string(), pa.int32())),
+    ("drops", pa.map_(pa.string(), pa.int32())),
+    ("raw", pa.string()),  # the full Sleeper payload (draft picks, FAAB, settings, ...) as JSON
+])
+
+
+def _league_dir(league_id: str) -> str:
+    return os.path.join(TRANSACTION_DIR, str(league_id))
+
+
+def _round_path(league_id: str, rnd: int) -> str:
+    return os.path.join(_league_dir(league_id), f"round={rnd}.parquet")
+
+
+def stored_rounds(league_id: str) -> list:
+    try:
+        names = os.listdir(_league_dir(league_id))
+    except OSError:
+        return []
+    return sorted(int(n[len("round="):-len(".parquet")]) for n in names
+                  if n.startswith("round=") and n.endswith(".parquet"))
+
+
+def transactions_to_table(rnd: int, transactions: list) -> pa.Table:
+    """Arrow table of one round's Sleeper transactions (TRANSACTION_SCHEMA)."""
+    rows = [t for t in transactions if t.get("transaction_id")]
+    return pa.table([
+        pa.array([str(t["transaction_id"]) for t in rows], pa.string()),
+        pa.array([t.get("type") for t in rows], pa.string()).dictionary_encode(),
+        pa.array([t.get("status") for t in rows], pa.string()).dictionary_encode(),
+        pa.array([t.get("leg") or rnd for t in rows], pa.int16()),
+        pa.array([t.get("created") for t in rows], pa.int64()),
+        pa.array([t.get("roster_ids") or [] for t in rows], pa.list_(pa.int32())),
+        pa.array([list((t.get("adds") or {}).items()) for t in rows], pa.map_(pa.string(), pa.int32())),
+        pa.array([list((t.get("drops") or {}).items()) for t in rows], pa.map_(pa.string(), pa.int32())),
+        pa.array([json.dumps(t) for t in rows], pa.string()),
+    ], schema=TRANSACTION_SCHEMA)
+
+
+def write_round(league_id: str, rnd: int, transactions: list) -> bool:
+    """Write one round's file and atomically swap it in; False (untouched) if it is unchanged."""
+    path = _round_path(league_id, rnd)
+    table = transactions_to_table(rnd, transactions)
+    try:
+        if pq.read_table(path).equals(table):
+            return False
+    except (OSError, pa.ArrowInvalid):
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+@traced
+def sync_transactions(league_id: str, current_round: int) -> list:
+    """
+    Fetch the rounds 1..current_round that are not stored yet, plus the current
+    and previous round, concurrently. Returns the rounds written (new or
+    changed); a round that fails to fetch is left for the next sync.
+    """
+    have = set(stored_rounds(league_id))
+    rounds = [r for r in range(1, max(current_round, 1) + 1) if r not in have or r >= current_round - 1]
+    paths = {r: f"league/{league_id}/transactions/{r}" for r in rounds}
+    fetched = sleeper_get_many(paths.values())
+
+    written = []
+    for rnd, path in paths.items():
+        if fetched[path] is not None and write_round(league_id, rnd, fetched[path]):
+            written.append(rnd)
+    return written
+
+
+class TransactionHistory:
+    """Read-only view over one league's stored rounds."""
+
+    def __init__(self, league_id: str, files: dict):
+        self.league_id = league_id
+        self.files = files  # round -> mtime the table was read at
+        tables = [pq.read_table(_round_path(league_id, r)) for r in sorted(files)]
+        table = pa.concat_tables(tables) if tables else TRANSACTION_SCHEMA.empty_table()
+        # One row per transaction_id: the copy from the latest round wins
+        ids = table.column("transaction_id").to_numpy(zero_copy_only=False)
+        _, last = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last)
+        self.table = table.take(pa.array(keep, pa.int64()))
+
+    @property
+    def rounds(self) -> list:
+        return sorted(self.files)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        """
+        One row per transaction, oldest first:
+        ['transaction_id', 'type', 'status', 'round', 'created', 'roster_ids', 'adds', 'drops']
+        adds / drops are {player_id: roster_id} dicts.
+        """
+        df = self.table.drop(["raw"]).to_pandas()
+        for col in ("type", "status"):
+            df[col] = df[col].astype(object)
+        for col in ("adds", "drops"):
+            df[col] = [dict(items) if items is not None else {} for items in df[col]]
+        return df.sort_values(["created", "transaction_id"]).reset_index(drop=True)
+
+    def transactions(self, types=None, status: str = "complete") -> pd.DataFrame:
+        """Rows of `df` with one of `types` (e.g. ('trade',)) and `status` (None: any)."""
+        df = self.df
+        mask = np.ones(len(df), bool)
+        if types is not None:
+            mask &= df["type"].isin(list(types)).to_numpy()
+        if status is not None:
+            mask &= (df["status"] == status).to_numpy()
+        return df[mask]
+
+    def trades(self) -> pd.DataFrame:
+        return self.transactions(["trade"])
+
+    def waivers(self) -> pd.DataFrame:
+        return self.transactions(["waiver"])
+
+    def free_agents(self) -> pd.DataFrame:
+        return self.transactions(["free_agent"])
+
+    def raw(self, transaction_id: str) -> dict:
+        """The original Sleeper payload of one transaction (None if unknown)."""
+        ids = self.table.column("transaction_id").to_pylist()
+        try:
+            return json.loads(self.table.column("raw")[ids.index(str(transaction_id))].as_py())
+        except ValueError:
+            return None
+
+    @cached_property
+    def moves(self) -> pd.DataFrame:
+        """
+        Every player movement, one row per add / drop:
+        ['transaction_id', 'type', 'status', 'round', 'created', 'player_id', 'roster_id', 'action']
+        Built straight from the map columns' offsets, without a per-transaction loop.
+        """
+        parts = []
+        for action in ("adds", "drops"):
+            col = self.table.column(action).combine_chunks()
+            offsets = col.offsets.to_numpy()
+            # keys / items are the whole child arrays; a sliced column starts part-way in
+            start, stop = offsets[0], offsets[-1]
+            parts.append(pd.DataFrame({
+                "row": np.repeat(np.arange(len(col)), np.diff(offsets)),
+                "player_id": col.keys[start:stop].to_numpy(zero_copy_only=False),
+                "roster_id": col.items[start:stop].to_numpy(zero_copy_only=False),
+                "action": action[:-1],
+            }))
+        moves = pd.concat(parts, ignore_index=True)
+        meta = self.table.select(["transaction_id", "type", "status", "round", "created"]).to_pandas()
+        for col in ("type", "status"):
+            meta[col] = meta[col].astype(object)
+        moves = meta.iloc[moves.pop("row")].reset_index(drop=True).join(moves)
+        return moves.sort_values(["created", "transaction_id", "action"], kind="stable").reset_index(drop=True)
+
+
+_lock = threading.Lock()
+_memo = {}  # league_id -> TransactionHistory
+
+
+@traced
+def get_transactions(league_id: str) -> TransactionHistory:
+    """The league's stored transactions, re-read only when a round file has changed."""
+    files = {}
+    for rnd in stored_rounds(league_id):
+        try:
+            files[rnd] = os.stat(_round_path(league_id, rnd)).st_mtime
+        except OSError:
+            pass
+    with _lock:
+        history = _memo.get(league_id)
+        note_cache(history is not None and history.files == files)
+        if history is None or history.files != files:
+            history = TransactionHistory(league_id, files)
+            _memo[league_id] = history
+    return history
@@ -1,64 +1,201 @@
-import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime, timezone
-import streamlit as st
-import sys, os
+import os
 from zoneinfo import ZoneInfo
 
+from disk_cache import DiskCache
+from fp_parser import parse_projections_table
+from instrumentation import traced
+from player_identity import SLEEPER_TO_FP_POSITION, attach_projections, projection_keys
+from player_store import get_player_store
+from scoring_engine import league_points
+from sleeper_client import FANTASYPROS_BASE_URL, sleeper_get, sleeper_get_many, http_get
+
 # -------------------------
 # League / Draft Functions
 # -------------------------
 
-def get_league_data(league_id: str):
-    """Fetch league metadata (name, scoring, users, rosters)."""
-    league = requests.get(f"https://api.sleeper.app/v1/league/{league_id}").json()
-    users = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/users").json()
-    rosters = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/rosters").json()
+# Per-league Sleeper endpoints that can be fetched independently of each other
+LEAGUE_ENDPOINTS = {
+    "league": "league/{league_id}",
+    "users": "league/{league_id}/users",
+    "rosters": "league/{league_id}/rosters",
+    "drafts": "league/{league_id}/drafts",
+    "matchups": "league/{league_id}/matchups/{week}",
+}
+
+
+@traced
+def fetch_league_endpoints(league_ids, endpoints, week=None) -> dict:
+    """
+    Fetch `endpoints` for every league in one concurrent batch.
+    Returns {league_id: {endpoint: json}} (None where a call failed).
 
+    Besides LEAGUE_ENDPOINTS, "picks" (first draft's picks) is supported, and
+    "matchups" without a `week` uses each league's current week (`leg`). Those
+    depend on league/drafts, so they go out in a second concurrent wave.
+    """
+    league_ids = list(league_ids)
+    endpoints = list(endpoints)
+    current_week = "matchups" in endpoints and week is None
+
+    first_wave = [e for e in endpoints if e in LEAGUE_ENDPOINTS and not (e == "matchups" and current_week)]
+    if "picks" in endpoints and "drafts" not in first_wave:
+        first_wave.append("drafts")
+    if current_week and "league" not in first_wave:
+        first_wave.append("league")
+
+    results = {lid: {} for lid in league_ids}
+    paths = {(lid, e): LEAGUE_ENDPOINTS[e].format(league_id=lid, week=week)
+             for lid in league_ids for e in first_wave}
+    fetched = sleeper_get_many(paths.values())
+    for (lid, e), path in paths.items():
+        results[lid][e] = fetched[path]
+
+    paths = {}
+    for lid, data in results.items():
+        if "picks" in endpoints:
+            drafts = data.get("drafts") or []
+            draft_id = drafts[0].get("draft_id") if drafts else None
+            if draft_id:
+                paths[(lid, "picks")] = f"draft/{draft_id}/picks"
+            else:
+                data["picks"] = []
+        if current_week:
+            leg = (data.get("league") or {}).get("settings", {}).get("leg", 1)
+            paths[(lid, "matchups")] = LEAGUE_ENDPOINTS["matchups"].format(league_id=lid, week=leg)
+    if paths:
+        fetched = sleeper_get_many(paths.values())
+        for (lid, e), path in paths.items():
+            results[lid][e] = fetched[path]
+
+    return {lid: {e: data.get(e) for e in endpoints} for lid, data in results.items()}
+
+
+def build_roster_to_owner(users, rosters) -> dict:
+    """Map roster_id -> owner display name."""
+    user_map = {u["user_id"]: u for u in users or []}
     roster_to_owner = {}
-    for roster in rosters:
+    for roster in rosters or []:
         roster_id = roster["roster_id"]
-        owner_id = roster.get("owner_id")
-        user = next((u for u in users if u["user_id"] == owner_id), None)
+        user = user_map.get(roster.get("owner_id"))
         roster_to_owner[roster_id] = user.get("display_name", f"Team {roster_id}") if user else f"Team {roster_id}"
+    return roster_to_owner
+
+
+def get_league_data(league_id: str):
+    """Fetch league metadata (name, scoring, users, rosters)."""
+    data = fetch_league_endpoints([league_id], ["league", "users", "rosters"])[league_id]
+    league = data["league"] or {}
+    roster_to_owner = build_roster_to_owner(data["users"], data["rosters"])
 
     return league, league.get("scoring_settings", {}), roster_to_owner
 
 
+def get_draft_time(draft: dict):
+    """Draft start time in Pacific time, or None if not scheduled."""
+    start_ms = draft.get("start_time")
+    if not start_ms:
+        return None
+    draft_time = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc)
+    return draft_time.astimezone(ZoneInfo("America/Los_Angeles"))
+
+
 def get_draft(league_id: str):
     """Fetch draft ID, picks, and draft time."""
     try:
-        drafts = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/drafts").json()
+        drafts = sleeper_get(f"league/{league_id}/drafts")
         if not drafts:
             return None, [], None
         draft = drafts[0]
         draft_id = draft.get("draft_id")
-        draft_time = None
-        start_ms = draft.get("start_time")
-        if start_ms:
-            draft_time = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc)
-            draft_time = draft_time.astimezone(ZoneInfo("America/Los_Angeles"))
-        picks = requests.get(f"https://api.sleeper.app/v1/draft/{draft_id}/picks").json() if draft_id else []
+        draft_time = get_draft_time(draft)
+        picks = sleeper_get(f"draft/{draft_id}/picks") if draft_id else []
         return draft_id, picks, draft_time
     except Exception as e:
         print(f"Error fetching draft for league {league_id}: {e}")
         return None, [], None
 
 
-def get_standings(league_id: str, week=None):
-    """Fetch standings (Owner, Wins, Losses, PF)."""
-    try:
-        users = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/users").json()
-        rosters = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/rosters").json()
-        user_map = {u["user_id"]: u["display_name"] for u in users}
+class LeagueSnapshot:
+    """
+    One league's Sleeper data, fetched once per page render and shared by
+    get_standings, get_draft_grades, calculate_power_scores and
+    get_matchups_with_owners: league, users, rosters, draft + picks and the
+    roster_id -> owner map. Matchups are fetched per week on first use.
+    """
 
+    ENDPOINTS = ["league", "users", "rosters", "drafts", "picks"]
+
+    def __init__(self, league_id: str, data: dict = None, with_matchups: bool = False):
+        if data is None:
+            endpoints = self.ENDPOINTS + (["matchups"] if with_matchups else [])
+            data = fetch_league_endpoints([league_id], endpoints)[league_id]
+        self.league_id = league_id
+        self.league = data.get("league") or {}
+        self.scoring = self.league.get("scoring_settings", {})
+        self.users = data.get("users") or []
+        self.rosters = data.get("rosters") or []
+        self.roster_to_owner = build_roster_to_owner(self.users, self.rosters)
+
+        drafts = data.get("drafts") or []
+        draft = drafts[0] if drafts else {}
+        self.draft_id = draft.get("draft_id")
+        self.draft_time = get_draft_time(draft)
+        self.picks = data.get("picks") or []
+
+        self._matchups = {}
+        if data.get("matchups") is not None:
+            self._matchups[self.current_week] = data["matchups"]
+
+    @classmethod
+    def load_many(cls, league_ids, with_matchups: bool = False) -> dict:
+        """Snapshots for several leagues from a single concurrent batch."""
+        endpoints = cls.ENDPOINTS + (["matchups"] if with_matchups else [])
+        fetched = fetch_league_endpoints(league_ids, endpoints)
+        return {lid: cls(lid, data) for lid, data in fetched.items()}
+
+    @property
+    def name(self) -> str:
+        return self.league.get("name", f"League {self.league_id}")
+
+    @property
+    def current_week(self) -> int:
+        return self.league.get("settings", {}).get("leg", 1)
+
+    @property
+    def regular_season_weeks(self) -> int:
+        """Last regular-season week (the week before playoffs start)."""
+        settings = self.league.get("settings", {})
+        return settings.get("playoff_week_start", settings.get("season_length", 14) + 1) - 1
+
+    def matchups(self, week: int = None) -> list:
+        """Sleeper matchup rows for `week` (default: current week)."""
+        week = self.current_week if week is None else week
+        if week not in self._matchups:
+            self._matchups[week] = sleeper_get(f"league/{self.league_id}/matchups/{week}")
+        return self._matchups[week]
+
+    def prefetch_matchups(self, weeks):
+        """Fetch the matchups of every week in `weeks` not loaded yet, concurrently."""
+        paths = {week: f"league/{self.league_id}/matchups/{week}" for week in weeks if week not in self._matchups}
+        fetched = sleeper_get_many(paths.values())
+        for week, path in paths.items():
+            self._matchups[week] = fetched[path] or []
+
+
+@traced
+def get_standings(snapshot: LeagueSnapshot, week=None):
+    """Standings (Owner, Wins, Losses, PF, PA) from a LeagueSnapshot."""
+    try:
         rows = []
-        for r in rosters:
-            owner = user_map.get(r.get("owner_id"), f"Team {r['roster_id']}")
+        for r in snapshot.rosters:
+            owner = snapshot.roster_to_owner[r["roster_id"]]
             settings = r.get("settings", {})
             rows.append({"Owner": owner, "Wins": settings.get("wins", 0),
-                         "Losses": settings.get("losses", 0), "PF": settings.get("fpts", 0)})
+                         "Losses": settings.get("losses", 0), "PF": settings.get("fpts", 0),
+                         "PA": settings.get("fpts_against", 0)})
         return pd.DataFrame(rows)
     except Exception as e:
         print(f"Error fetching standings: {e}")
@@ -69,20 +206,40 @@ def get_standings(league_id: str, week=None):
 # Draft Grades / Projections
 # -------------------------
 
-def fetch_fp_projections(position: str) -> pd.DataFrame:
-    """Fetch FantasyPros seasonal projections using html5lib."""
-    url = f"https://www.fantasypros.com/nfl/projections/{position}.php?week=draft"
-    r = requests.get(url)
+# Parsed FantasyPros tables, shared by all sessions until they go stale
+PROJECTION_TTL = float(os.environ.get("SWISH_PROJECTION_TTL", 6 * 60 * 60))
+PROJECTION_CACHE_BYTES = int(os.environ.get("SWISH_PROJECTION_CACHE_BYTES", 64 * 1024 * 1024))
+_projection_cache = DiskCache("fp_projections", ttl=PROJECTION_TTL, max_bytes=PROJECTION_CACHE_BYTES)
+
+
+@traced
+def fetch_fp_projections(position: str, week="draft") -> pd.DataFrame:
+    """
+    Fetch FantasyPros projections (seasonal by default) as typed columns:
+    Player, Team, Position, stat columns (PASSING_YDS, ...) and FPTS.
+    Parsed tables are cached on disk per (position, week) for PROJECTION_TTL seconds.
+    """
+    key = (position, str(week))
+    df = _projection_cache.get(key)
+    if df is not None:
+        return df
+
+    url = f"{FANTASYPROS_BASE_URL}/nfl/projections/{position}.php?week={week}"
+    r = http_get(url)
     r.raise_for_status()
-    tables = pd.read_html(r.text, flavor='html5lib')
-    if not tables:
-        st.warning(f"No tables found for {position.upper()} projections.")
+    df = parse_projections_table(r.text)
+    if df.empty:
+        print(f"No tables found for {position.upper()} projections.")
         return pd.DataFrame()
-    df = tables[0]
+    df = split_player_team(df)
     df['Position'] = position.upper()
+    stat_cols = [c for c in df.columns if c not in ('Player', 'Team', 'Position')]
+    df = df[['Player', 'Team', 'Position'] + stat_cols]
+    _projection_cache.set(key, df)
     return df
 
 
+@traced
 def get_all_projections() -> pd.DataFrame:
     dfs = []
     for pos in ['qb', 'rb', 'wr', 'te']:
@@ -91,23 +248,93 @@ def get_all_projections() -> pd.DataFrame:
             if not df.empty:
                 dfs.append(df)
         except Exception as e:
-            st.error(f"Error fetching {pos.upper()} projections: {e}")
+            print(f"Error fetching {pos.upper()} projections: {e}")
     return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
 
 
-def calculate_dynamic_vorp(proj_df: pd.DataFrame):
-    """Calculate VORP based on replacement-level players."""
-    replacement_targets = {'QB': 13, 'RB': 25, 'WR': 37, 'TE': 13}
-    vorp = {}
-    for pos, group in proj_df.groupby('Position'):
-        group_sorted = group.sort_values('FPTS', ascending=False).reset_index(drop=True)
-        cutoff_idx = min(replacement_targets.get(pos, len(group_sorted)) - 1, len(group_sorted) - 1)
-        replacement_value = group_sorted.loc[cutoff_idx, 'FPTS']
-        for _, row in group_sorted.iterrows():
-            vorp[row['Player']] = row['FPTS'] - replacement_value
-    return vorp
+# Replacement rank per position when no league settings are available (12 teams)
+DEFAULT_REPLACEMENT_TARGETS = {'QB': 13, 'RB': 25, 'WR': 37, 'TE': 13}
+
+# How each flex roster slot is split across the positions that usually fill it
+FLEX_SHARES = {
+    'FLEX': {'RB': 0.45, 'WR': 0.45, 'TE': 0.10},
+    'WRRB_FLEX': {'RB': 0.5, 'WR': 0.5},
+    'REC_FLEX': {'WR': 0.8, 'TE': 0.2},
+    'SUPER_FLEX': {'QB': 0.8, 'RB': 0.1, 'WR': 0.1},
+}
+NON_STARTER_SLOTS = {'BN', 'IR', 'TAXI'}
+
+
+def get_replacement_targets(league: dict = None) -> dict:
+    """
+    Replacement rank per position for a Sleeper league: the first player past
+    (teams x starters at the position), with flex slots split by FLEX_SHARES.
+    """
+    roster_positions = (league or {}).get('roster_positions')
+    if not roster_positions:
+        return dict(DEFAULT_REPLACEMENT_TARGETS)
+
+    num_teams = league.get('total_rosters') or league.get('settings', {}).get('num_teams', 12)
+    starters = {}
+    for slot in roster_positions:
+        if slot in NON_STARTER_SLOTS:
+            continue
+        slot = SLEEPER_TO_FP_POSITION.get(slot, slot)
+        for pos, share in FLEX_SHARES.get(slot, {slot: 1}).items():
+            starters[pos] = starters.get(pos, 0) + share
+    return {pos: int(round(num_teams * n)) + 1 for pos, n in starters.items()}
+
+
+@traced
+def calculate_league_vorp(proj_df: pd.DataFrame, leagues: dict, key: str = 'Player') -> pd.DataFrame:
+    """
+    VORP for every player under every league's scoring and replacement levels, in one batch.
+
+    proj_df: DataFrame with [key, 'Position', 'FPTS'] and the projection stat columns
+    leagues: {league_id: Sleeper league dict (or None for FPTS and the default targets)}
+    Returns a DataFrame indexed by `key` (Player name by default) with one column per league_id.
+    """
+    df = proj_df.dropna(subset=['FPTS'])
+    points = league_points(df, leagues).to_numpy()
+    position_codes, positions = pd.factorize(df['Position'])
+    targets = [get_replacement_targets(league) for league in leagues.values()]
+
+    # Replacement points per (position, league): the target-th best player at the position
+    # under that league's scoring; positions a league doesn't start use the last player
+    replacement = np.empty((len(positions), len(leagues)))
+    for i, pos in enumerate(positions):
+        ranked = -np.sort(-points[position_codes == i], axis=0)
+        ranks = [min(t.get(pos, len(ranked)), len(ranked)) - 1 for t in targets]
+        replacement[i] = ranked[ranks, np.arange(len(leagues))]
+
+    vorp = points - replacement[position_codes]
+    vorp_df = pd.DataFrame(vorp, index=df[key].to_numpy(), columns=list(leagues))
+    # Same name at two positions / twice in a table: keep the more valuable entry
+    return vorp_df.groupby(level=0, sort=False).max()
+
+
+@traced
+def add_vorp_column(proj_df: pd.DataFrame, league: dict = None) -> pd.DataFrame:
+    """Copy of proj_df (rows with FPTS) with 'proj_key' and the league's 'VORP' per row."""
+    return add_league_vorp_columns(proj_df, {'vorp': league})['vorp']
+
+
+@traced
+def add_league_vorp_columns(proj_df: pd.DataFrame, leagues: dict) -> dict:
+    """add_vorp_column for every league in {league_id: league}, from one calculate_league_vorp batch."""
+    proj_df = proj_df.dropna(subset=['FPTS']).copy()
+    proj_df['proj_key'] = projection_keys(proj_df)
+    vorp = calculate_league_vorp(proj_df, leagues, key='proj_key')
+    return {lid: proj_df.assign(VORP=proj_df['proj_key'].map(vorp[lid])) for lid in leagues}
+
+
+@traced
+def calculate_dynamic_vorp(proj_df: pd.DataFrame, league: dict = None, key: str = 'Player') -> pd.Series:
+    """Calculate VORP in the league's scoring based on replacement-level players (Series indexed by `key`)."""
+    return calculate_league_vorp(proj_df, {'vorp': league}, key=key)['vorp']
 
 
+@traced
 def assign_grades(team_scores: dict):
     values = list(team_scores.values())
     mean = np.mean(values)
@@ -128,9 +355,17 @@ def assign_grades(team_scores: dict):
         grades[team] = (score, grade)
     return grades
 
-def split_player_team(proj_df: pd.DataFrame):
-    import re
+# Name suffixes dropped from projection names, and "<name> <TEAM>" parsing
+NAME_SUFFIX_RE = r'(?:^| )(?:Jr|Jr\.|II|III|IV|V)$'
+TEAM_TOKEN_RE = r'[A-Za-z]{2,3}'
+
 
+@traced
+def split_player_team(proj_df: pd.DataFrame):
+    """
+    Split 'Player' ("Josh Allen BUF") into 'Player' ("Josh Allen") and 'Team' ("BUF").
+    A trailing suffix (Jr., II, ...) is dropped; Team is None when there is no team token.
+    """
     # Flatten MultiIndex columns if necessary
     if isinstance(proj_df.columns, pd.MultiIndex):
         proj_df.columns = ['_'.join(filter(None, col)).strip() for col in proj_df.columns.values]
@@ -140,132 +375,124 @@ def split_player_team(proj_df: pd.DataFrame):
         player_col = [c for c in proj_df.columns if 'Player' in c][0]
         proj_df = proj_df.rename(columns={player_col: 'Player'})
 
-    # Known suffixes to drop
-    suffixes = {"Jr", "Jr.", "II", "III", "IV", "V"}
+    raw = proj_df['Player']
+    normalized = raw.str.strip().str.replace(r'\s+', ' ', regex=True)
+    has_space = normalized.str.contains(' ', regex=False, na=False)
 
-    def parse_name_team(s):
-        tokens = s.strip().split()
-        if len(tokens) < 2:
-            return pd.Series([s, None])
+    # Last token is a team when it is 2-3 letters (any case -- it gets upper-cased)
+    last_token = normalized.str.extract(r'(\S+)$', expand=False)
+    is_team = has_space & last_token.str.fullmatch(TEAM_TOKEN_RE, na=False)
 
-        last_token = tokens[-1].upper()
-        team_pattern = r'^[A-Z]{2,3}$'
+    name = normalized.where(~is_team, normalized.str.replace(r' \S+$', '', regex=True))
+    name = name.str.replace(NAME_SUFFIX_RE, '', regex=True)
 
-        if re.fullmatch(team_pattern, last_token):
-            team = last_token
-            # Remove suffix if present before team
-            name_tokens = tokens[:-1]
-            if name_tokens[-1] in suffixes:
-                name_tokens = name_tokens[:-1]
-            name = " ".join(name_tokens)
-        else:
-            # No team detected
-            team = None
-            name_tokens = tokens
-            if name_tokens[-1] in suffixes:
-                name_tokens = name_tokens[:-1]
-            name = " ".join(name_tokens)
-
-        return pd.Series([name, team])
-
-    proj_df[['Player', 'Team']] = proj_df['Player'].apply(parse_name_team)
+    # Single-token (or empty) values pass through untouched, as before
+    proj_df['Player'] = raw.where(~has_space, name)
+    proj_df['Team'] = last_token.str.upper().astype(object).where(is_team, None)
     return proj_df
 
 def get_league_names(league_ids: dict):
-    """Fetch names for all league IDs."""
-    for lid in league_ids.keys():
-        try:
-            data = requests.get(f"https://api.sleeper.app/v1/league/{lid}").json()
-            league_ids[lid] = data.get("name", f"League {lid}")
-        except:
-            league_ids[lid] = f"League {lid}"
+    """Fetch names for all league IDs (concurrently)."""
+    fetched = fetch_league_endpoints(league_ids.keys(), ["league"])
+    for lid, data in fetched.items():
+        league = data["league"] or {}
+        league_ids[lid] = league.get("name", f"League {lid}")
     return league_ids
 
 
-def get_draft_grades(league_id: str) -> pd.DataFrame:
+@traced
+def get_draft_grades(snapshot: LeagueSnapshot, proj_df: pd.DataFrame = None) -> pd.DataFrame:
     """
     Returns a DataFrame with draft scores per team:
     Columns: ['Owner', 'Draft Score']
+    proj_df: projections, optionally with the league's VORP already added (fetched if omitted)
     """
-    # Fetch league + roster info
-    league, scoring, roster_to_owner = get_league_data(league_id)
-    draft_id, picks, draft_time = get_draft(league_id)
+    picks = snapshot.picks
+    roster_to_owner = snapshot.roster_to_owner
     if not picks:
         return pd.DataFrame()
 
     # Get projections
-    proj_df = get_all_projections()
+    proj_df = get_all_projections() if proj_df is None else proj_df
     if proj_df.empty:
         return pd.DataFrame()
 
-    # Flatten multi-level columns if needed
-    if isinstance(proj_df.columns, pd.MultiIndex):
-        proj_df.columns = ['_'.join(filter(None, col)).strip() for col in proj_df.columns.values]
-
-    proj_df = proj_df.rename(columns={'MISC_FPTS': 'FPTS','Unnamed: 0_level_0_Player':'Player'})
-    proj_df = split_player_team(proj_df)
-    proj_df = proj_df[['Player', 'FPTS', 'Position']].dropna(subset=['FPTS'])
-    proj_df['FPTS'] = proj_df['FPTS'].astype(float)
-
-    vorp = calculate_dynamic_vorp(proj_df)
+    picks_df = score_draft_picks(picks, proj_df, snapshot.league)
 
     # Tally team draft scores
-    team_scores = {}
-    for pick in picks:
-        player_name = pick.get("metadata", {}).get("first_name", "") + " " + pick.get("metadata", {}).get("last_name", "")
-        roster_id = pick["roster_id"]
-        value = vorp.get(player_name, 0)
-        team_scores[roster_id] = team_scores.get(roster_id, 0) + value
-
-    # Build DataFrame
-    results = []
-    for roster_id, score in team_scores.items():
-        owner_name = roster_to_owner.get(roster_id, f"Team {roster_id}")
-        results.append({"Owner": owner_name, "Draft Score": score})
-
-    df = pd.DataFrame(results)
+    df = picks_df.groupby("roster_id", sort=False)["Value"].sum().reset_index(name="Draft Score")
+    df.insert(0, "Owner", df.pop("roster_id").map(lambda rid: roster_to_owner.get(rid, f"Team {rid}")))
     return df
 
+
+@traced
+def score_draft_picks(picks: list, proj_df: pd.DataFrame, league: dict = None) -> pd.DataFrame:
+    """
+    One row per draft pick with its VORP under the league's replacement levels.
+    Columns: ['roster_id', 'player_id', 'Player', 'Value'] (Value is 0 without a projection).
+    proj_df: projections; VORP is computed for `league` unless proj_df already has it (add_vorp_column).
+    """
+    if 'VORP' not in proj_df:
+        proj_df = add_vorp_column(proj_df, league)
+
+    picks_df = pd.DataFrame({
+        "roster_id": [p["roster_id"] for p in picks],
+        "player_id": [p.get("player_id") for p in picks],
+        "Player": [f'{p.get("metadata", {}).get("first_name", "")} {p.get("metadata", {}).get("last_name", "")}' for p in picks],
+    })
+    picks_df = attach_projections(picks_df, proj_df, ['VORP'])
+    picks_df["Value"] = picks_df["VORP"].fillna(0)
+    return picks_df[["roster_id", "player_id", "Player", "Value"]]
+
 # ------------------------
 # Player metadata helper
 # ------------------------
-def get_player_map(csv_path="player_ids.csv") -> dict:
+@traced
+def get_player_map(block: bool = True) -> dict:
     """
     Returns a dictionary mapping Sleeper player_id -> player_name.
-    Saves locally to CSV to avoid repeated API calls.
+    Backed by the shared, memory-mapped player store (see player_store.py);
+    block=False returns {} instead of waiting for a store that isn't built yet.
     """
-    if os.path.exists(csv_path):
-        player_df = pd.read_csv(csv_path)
-    else:
-        try:
-            resp = requests.get("https://api.sleeper.app/v1/players/nfl")
-            resp.raise_for_status()
-            data = resp.json()
-            player_df = pd.DataFrame.from_dict(data, orient="index")
-            player_df = player_df[['full_name']]
-            player_df.reset_index(inplace=True)
-            player_df.rename(columns={"index":"player_id", "full_name":"player_name"}, inplace=True)
-            player_df.to_csv(csv_path, index=False)
-        except Exception as e:
-            st.error(f"Failed to fetch player metadata: {e}")
-            return {}
+    try:
+        store = get_player_store(block)
+        return store.names if store is not None else {}
+    except Exception as e:
+        print(f"Failed to fetch player metadata: {e}")
+        return {}
 
-    return dict(zip(player_df["player_id"], player_df["player_name"]))
 
-def calculate_power_scores(standings_df, draft_grades_df, league):
+@traced
+def get_player_info(block: bool = True) -> pd.DataFrame:
+    """
+    Player metadata indexed by Sleeper player_id: name, position, team, status
+    (empty with block=False while the store isn't built yet).
+    """
+    try:
+        store = get_player_store(block)
+        if store is not None:
+            return store.df
+    except Exception as e:
+        print(f"Failed to fetch player metadata: {e}")
+    return pd.DataFrame(columns=["name", "position", "team", "status"])
+
+@traced
+def calculate_power_scores(standings_df, draft_grades_df, snapshot: LeagueSnapshot, week: int = None):
     """
     Compute power scores by weighting record vs draft grade based on season progress.
     
     standings_df: DataFrame with ['Owner', 'Wins', 'Losses', 'PF', 'PA']
     draft_grades_df: DataFrame with ['Owner', 'Draft Score']
-    league: dict from Sleeper API with 'settings' -> 'season_length' and 'leg'
+    snapshot: LeagueSnapshot; league 'settings' -> 'season_length' and 'leg' set the weights
+    week: score as of this week instead of 'leg' (standings through week - 1)
     """
+    league = snapshot.league
     # Merge standings with draft grades
     merged = standings_df.merge(draft_grades_df, on="Owner", how="left")
 
     # Season progress
     season_length = league.get("settings", {}).get("season_length", 14)
-    current_week = league.get("settings", {}).get("leg", 1)
+    current_week = league.get("settings", {}).get("leg", 1) if week is None else week
     weeks_remaining = max(season_length - current_week + 1, 0)
     projection_weight = weeks_remaining / season_length
     record_weight = 1 - projection_weight
@@ -285,12 +512,12 @@ def calculate_power_scores(standings_df, draft_grades_df, league):
 
     return merged
 
-def get_matchups_with_owners(rosters_df: pd.DataFrame, roster_to_owner: dict, merged_power_df: pd.DataFrame):
+@traced
+def get_matchups_with_owners(snapshot: LeagueSnapshot, merged_power_df: pd.DataFrame, week: int = None):
     """
     Returns a DataFrame where each row represents a matchup between two or more teams.
 
-    rosters_df: Sleeper rosters for a given week (must include 'roster_id' and 'matchup_id')
-    roster_to_owner: dict mapping roster_id -> owner name
+    snapshot: LeagueSnapshot (matchups for `week`, default current week, and roster_id -> owner)
     merged_power_df: DataFrame with Power Score ('Owner', 'Power Score')
 
     Returns:
@@ -301,6 +528,12 @@ def get_matchups_with_owners(rosters_df: pd.DataFrame, roster_to_owner: dict, me
         - 'avg_power' (mean Power Score of the teams in matchup)
         - 'Matchup' (string, e.g., "Alice vs Bob")
     """
+    roster_to_owner = snapshot.roster_to_owner
+    rosters_df = pd.DataFrame([{
+        "roster_id": m.get("roster_id"),
+        "matchup_id": m.get("matchup_id")
+    } for m in snapshot.matchups(week)], columns=["roster_id", "matchup_id"])
+
     matchups_list = []
     for matchup_id, group in rosters_df.groupby("matchup_id"):
         if matchup_id == 0:  # 0 = bye / no opponent
@@ -321,52 +554,69 @@ def get_matchups_with_owners(rosters_df: pd.DataFrame, roster_to_owner: dict, me
     return pd.DataFrame(matchups_list)
 
 
-def fetch_weekly_projections(current_week: int = 1):
+@traced
+def fetch_weekly_projections(current_week: int = 1, league: dict = None) -> pd.DataFrame:
     """
-    Fetch weekly fantasy projections from FantasyPros for the given week.
-    Returns a dict: player_name -> projected_points.
+    Fetch weekly fantasy projections from FantasyPros for the given week,
+    scored with the league's scoring settings (FantasyPros FPTS without a league).
+    Returns a DataFrame: ['Player', 'Team', 'Position', 'Proj Points'].
     """
     positions = ["qb", "rb", "wr", "te", "k", "dst"]
     all_dfs = []
 
     for pos in positions:
-        url = f"https://www.fantasypros.com/nfl/projections/{pos}.php?week={current_week}"
         try:
-            r = requests.get(url)
-            r.raise_for_status()
-            tables = pd.read_html(r.text, flavor="html5lib")
-            if tables:
-                df = tables[0]
-
-                # Ensure column names are standard
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = ['_'.join(filter(None, col)).strip() for col in df.columns.values]
-
-                # Keep necessary columns
-                # Many tables have Player column and FPTS or similar
-                possible_points_cols = [c for c in df.columns if 'FPTS' in c.upper() or 'PTS' in c.upper()]
-                if not possible_points_cols:
-                    st.warning(f"No projected points column found for {pos.upper()}")
+            df = fetch_fp_projections(pos, current_week)
+            if not df.empty:
+                if 'FPTS' not in df.columns:
+                    print(f"No projected points column found for {pos.upper()}")
                     continue
 
-                df = df.rename(columns={possible_points_cols[0]: 'Proj Points', df.columns[0]: 'Player'})
-                df['Position'] = pos.upper()
-
-                # Split out Player Name / Team if combined
-                df = split_player_team(df)
-                df['Proj Points'] = pd.to_numeric(df['Proj Points'], errors='coerce')
-                df = df.dropna(subset=['Proj Points'])
-
-                all_dfs.append(df[['Player', 'Team', 'Position', 'Proj Points']])
+                all_dfs.append(df.dropna(subset=['FPTS']))
         except Exception as e:
-            st.error(f"Error fetching {pos.upper()} projections: {e}")
+            print(f"Error fetching {pos.upper()} projections: {e}")
             continue
 
     if all_dfs:
-        all_proj_df = pd.concat(all_dfs, ignore_index=True)
-        # Create mapping player_name -> projected points
-        proj_map = dict(zip(all_proj_df['Player'], all_proj_df['Proj Points']))
-        return proj_map
+        df = pd.concat(all_dfs, ignore_index=True)
+        df['Proj Points'] = league_points(df, {'Proj Points': league})['Proj Points']
+        return df[['Player', 'Team', 'Position', 'Proj Points']]
     else:
-        st.warning("No projections found.")
-        return {}
+        print("No projections found.")
+        return pd.DataFrame(columns=['Player', 'Team', 'Position', 'Proj Points'])
+
+
+@traced
+def get_starters_df(matchups_week, selected_matchup_id, roster_to_owner, weekly_proj_df, player_map):
+    """
+    Returns a DataFrame of starters for a given matchup (every matchup if
+    selected_matchup_id is None), with position and projected weekly points.
+
+    matchups_week: list of matchup dicts from Sleeper API
+    selected_matchup_id: the matchup_id we want, or None
+    roster_to_owner: dict mapping roster_id -> owner name
+    weekly_proj_df: DataFrame from fetch_weekly_projections (Player, Team, Position, Proj Points)
+    player_map: dict mapping player_id -> player_name
+    """
+    # Filter only the rows for the selected matchup
+    matchup_rows = [m for m in matchups_week
+                    if m.get("matchup_id") and selected_matchup_id in (None, m["matchup_id"])]
+
+    df = pd.DataFrame(
+        [(m["matchup_id"], m["roster_id"], player_id) for m in matchup_rows for player_id in m.get("starters") or []],
+        columns=["Matchup ID", "Roster ID", "player_id"]
+    )
+    df["Owner"] = df["Roster ID"].map(lambda rid: roster_to_owner.get(rid, f"Team {rid}"))
+    df["Player"] = df["player_id"].map(player_map).fillna("Unknown Player")
+
+    # Projected points joined by Sleeper player_id through the identity index
+    df = attach_projections(df, weekly_proj_df, ["Proj Points", "Position"])
+    df["Proj Points"] = df["Proj Points"].fillna(0).round(1)
+    df = df[["Matchup ID", "Roster ID", "Owner", "Player", "Position", "Proj Points"]]
+
+    # Calculate total projected points per owner
+    totals = df.groupby("Owner")["Proj Points"].sum().reset_index()
+    totals = totals.rename(columns={"Proj Points": "Total Proj Points"})
+
+    # Merge total back into the starters df
+    return df.merge(totals, on="Owner", how="left")